@@ -195,6 +195,23 @@ def get_db_connection():
     ensure_dirs()
     return sqlite3.connect(DB_PATH)
 
+def open_db():
+    """Open the observatory database with the shared tuning applied.
+
+    One place for the connection setup the pipeline scripts were each
+    repeating: rows addressable by column name, WAL with relaxed fsync,
+    in-memory temp tables, a 64MB page cache and a 256MB mmap window.
+    """
+    import sqlite3
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
 # =============================================================================
 # VALIDATION
 # =============================================================================
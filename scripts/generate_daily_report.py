@@ -21,9 +21,11 @@ import sys
 import sqlite3
 import json
 import csv
+import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from config import DB_PATH
 
@@ -466,43 +468,29 @@ def get_reputation_leaders(cursor, limit=10):
     return cursor.fetchall()
 
 
-def export_raw_data(cursor, output_dir):
-    """Export raw data to CSV files."""
-    raw_dir = output_dir / "raw"
-    raw_dir.mkdir(parents=True, exist_ok=True)
-
-    # Posts
-    cursor.execute("SELECT id, title, author, upvotes, downvotes, comment_count, created_at FROM posts")
-    with open(raw_dir / "posts.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['id', 'title', 'author', 'upvotes', 'downvotes', 'comments', 'created_at'])
-        writer.writerows(cursor.fetchall())
-
-    # Network edges
-    cursor.execute("""
+# CSV exports for the raw/ folder: (filename, header, query)
+RAW_EXPORTS = [
+    ("posts.csv",
+     ['id', 'title', 'author', 'upvotes', 'downvotes', 'comments', 'created_at'],
+     "SELECT id, title, author, upvotes, downvotes, comment_count, created_at FROM posts"),
+    ("network.csv",
+     ['source', 'target', 'type', 'weight'],
+     """
         SELECT author_from, author_to, interaction_type, COUNT(*) as weight
         FROM interactions
         GROUP BY author_from, author_to, interaction_type
-    """)
-    with open(raw_dir / "network.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['source', 'target', 'type', 'weight'])
-        writer.writerows(cursor.fetchall())
-
-    # Memes
-    cursor.execute("""
+     """),
+    ("memes.csv",
+     ['phrase', 'occurrences', 'authors', 'first_author', 'category', 'first_seen'],
+     """
         SELECT phrase, occurrence_count, authors_count, first_author, category, first_seen_at
         FROM memes
         ORDER BY authors_count DESC
         LIMIT 500
-    """)
-    with open(raw_dir / "memes.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['phrase', 'occurrences', 'authors', 'first_author', 'category', 'first_seen'])
-        writer.writerows(cursor.fetchall())
-
-    # Actor profiles
-    cursor.execute("""
+     """),
+    ("actors.csv",
+     ['username', 'centrality', 'role', 'role_confidence', 'reputation', 'tier'],
+     """
         SELECT a.username, a.network_centrality,
                ar.primary_role, ar.role_confidence,
                rh.reputation_score, rh.tier
@@ -515,22 +503,43 @@ def export_raw_data(cursor, output_dir):
         ) rh ON a.username = rh.username AND rh.rn = 1
         WHERE a.network_centrality IS NOT NULL
         ORDER BY a.network_centrality DESC
-    """)
-    with open(raw_dir / "actors.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['username', 'centrality', 'role', 'role_confidence', 'reputation', 'tier'])
-        writer.writerows(cursor.fetchall())
-
-    # Conflicts
-    cursor.execute("""
+     """),
+    ("conflicts.csv",
+     ['actor_a', 'actor_b', 'topic', 'outcome', 'winner', 'intensity', 'timestamp'],
+     """
         SELECT actor_a, actor_b, topic, outcome, winner, intensity, timestamp
         FROM conflicts
         ORDER BY timestamp DESC
-    """)
-    with open(raw_dir / "conflicts.csv", 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['actor_a', 'actor_b', 'topic', 'outcome', 'winner', 'intensity', 'timestamp'])
-        writer.writerows(cursor.fetchall())
+     """),
+]
+
+
+def export_raw_data(output_dir):
+    """Export raw data to CSV files.
+
+    The five table exports are independent read-only queries, so each runs
+    on its own connection in a worker thread. Rows are streamed straight
+    from the cursor into csv.writer, so only one row is resident in memory
+    at a time regardless of table size.
+    """
+    raw_dir = output_dir / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+
+    def export_one(filename, header, query):
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            db_cursor = conn.execute(query)
+            with open(raw_dir / filename, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(db_cursor)
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=len(RAW_EXPORTS)) as executor:
+        futures = [executor.submit(export_one, *spec) for spec in RAW_EXPORTS]
+        for future in futures:
+            future.result()
 
     return raw_dir
 
@@ -814,8 +823,25 @@ def generate_report_markdown(stats, themes, top_actors, conflicts, memes, reputa
     return '\n'.join(report)
 
 
+def write_if_changed(path, text):
+    """Write text only when it differs from what's on disk.
+
+    Skipping identical writes avoids needless disk churn and downstream
+    static-site rebuild triggers keyed on mtime.
+    """
+    new_bytes = text.encode('utf-8')
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(new_bytes).digest():
+        return False
+    path.write_bytes(new_bytes)
+    return True
+
+
 def generate_metadata(stats, output_dir):
-    """Generate metadata.json for archival value."""
+    """Generate metadata.json for archival value.
+
+    Files are rewritten only when their content actually changed (the
+    volatile last_scan timestamp is excluded from the comparison).
+    """
     metadata = {
         "dataset": {
             "name": f"Noosphere Project Daily Report",
@@ -877,8 +903,22 @@ def generate_metadata(stats, output_dir):
         "citation": f"Noosphere Project ({stats['date']}). Daily Field Report. https://noosphereproject.com"
     }
 
-    with open(output_dir / "metadata.json", 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    metadata_path = output_dir / "metadata.json"
+
+    def _without_last_scan(meta):
+        meta = json.loads(json.dumps(meta))
+        meta.get('source', {}).pop('last_scan', None)
+        return meta
+
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        previous = None
+
+    if previous is None or _without_last_scan(previous) != _without_last_scan(metadata):
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
 
     # Also generate README.md
     readme = f"""# Dataset {stats['date']}
@@ -935,8 +975,7 @@ https://noosphereproject.com
 - Twitter: @NoosphereProj
 """
 
-    with open(output_dir / "README.md", 'w', encoding='utf-8') as f:
-        f.write(readme)
+    write_if_changed(output_dir / "README.md", readme)
 
     return output_dir
 
@@ -984,6 +1023,11 @@ def run_daily_report():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     conn = sqlite3.connect(DB_PATH)
+    # WAL: czytelnicy raportu nie blokuja sie ze skanerami piszacymi do bazy
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
     cursor = conn.cursor()
 
     print(f"\n>> Generating report for {today}...")
@@ -1027,7 +1071,7 @@ def run_daily_report():
 
     # Export raw data
     print("   Exporting raw data...")
-    export_raw_data(cursor, output_dir)
+    export_raw_data(output_dir)
 
     # Save stats for tomorrow's delta
     print("   Saving stats for delta tracking...")
@@ -7,6 +7,20 @@ Wynik: website/data/latest.json
 import sys
 import sqlite3
 import json
+import heapq
+import re
+
+# orjson jest ~3-10x szybszy od stdlib json przy duzych payloadach (opcjonalny)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pandas wektoryzuje zliczanie tematow (jedna petla C na temat)
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 from datetime import datetime
 from collections import defaultdict
 from pathlib import Path
@@ -26,10 +40,71 @@ except ImportError:
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+# Cache fragmentow dashboardu - sekcje regenerujemy tylko gdy zmienily sie
+# ich tabele zrodlowe (klucz: MAX(rowid) + COUNT(*) kazdej tabeli).
+CACHE_PATH = DB_PATH.parent / "dashboard_cache.json"
+
+# Tabele zrodlowe kazdej sekcji latest.json
+SECTION_SOURCES = {
+    "meta": ["posts"],
+    "alerts": ["interpretations"],
+    "sentiment": ["patterns"],
+    "topPosts": ["posts"],
+    "actorsToWatch": ["posts", "actors_meta"],
+    "themes": ["posts"],
+    "redFlags": [],
+    "politicalEconomy": ["patterns"],
+    "timeline": ["posts"],
+}
+
+# Sekcje z oknem czasowym (datetime('now', '-24 hours')) - odswiezamy
+# co najmniej raz na godzine, nawet gdy tabela sie nie zmienila
+TIME_WINDOWED_SECTIONS = {"alerts", "sentiment", "politicalEconomy"}
+
+
+def section_cache_key(cursor, section):
+    """Zbuduj klucz cache dla sekcji na podstawie wersji tabel zrodlowych."""
+    key = []
+    for table in SECTION_SOURCES.get(section, []):
+        try:
+            cursor.execute(f"SELECT MAX(rowid), COUNT(*) FROM {table}")
+            max_rowid, count = cursor.fetchone()
+        except sqlite3.OperationalError:
+            max_rowid, count = None, None
+        key.append([table, max_rowid, count])
+    if section in TIME_WINDOWED_SECTIONS:
+        key.append(["hour", datetime.now().strftime("%Y-%m-%d %H")])
+    return key
+
+
+def load_section_cache():
+    """Wczytaj cache fragmentow (pusty dict gdy brak/uszkodzony)."""
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_section_cache(cache):
+    """Zapisz cache fragmentow."""
+    try:
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning(f"Nie udalo sie zapisac cache dashboardu: {e}")
+
 
 def get_db():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # Dashboard tylko czyta - mmap + wiekszy cache omijaja syscalle IO
+    conn.executescript(
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA query_only=1;"
+    )
     return conn
 
 
@@ -44,8 +119,9 @@ def generate_meta(cursor):
     cursor.execute("SELECT SUM(comment_count) FROM posts")
     engagement = cursor.fetchone()[0] or 0
 
+    # lastUpdate stempluje main() przy kazdym biegu, po scaleniu cache -
+    # tutaj tylko pola policzalne, zeby fragment byl cache'owalny
     return {
-        "lastUpdate": datetime.now().strftime("%Y-%m-%d %H:%M"),
         "postsAnalyzed": posts,
         "uniqueActors": authors,
         "totalEngagement": engagement,
@@ -96,17 +172,17 @@ def generate_sentiment(cursor):
         "emancipatory": 0
     }
 
-    total = 0
     for row in cursor.fetchall():
         name = row["name"].replace("human_sentiment_", "")
         if name in sentiment:
             sentiment[name] = row["confidence"]
-            total += row["confidence"]
 
-    # Normalizuj do 100%
+    # Normalizuj do 100% - jeden wspolny mnoznik zamiast dzielenia per klucz
+    total = sum(sentiment.values())
     if total > 0:
+        scale = 100.0 / total
         for key in sentiment:
-            sentiment[key] = round(sentiment[key] / total * 100, 1)
+            sentiment[key] = round(sentiment[key] * scale, 1)
     else:
         # Domyslne wartosci
         sentiment = {"hierarchical": 62, "servile": 18, "instrumental": 12, "emancipatory": 8}
@@ -116,13 +192,23 @@ def generate_sentiment(cursor):
 
 def generate_top_posts(cursor, limit=5):
     """Generuj top posty."""
-    cursor.execute("""
-        SELECT title, author, comment_count, submolt,
-               CAST(comment_count AS FLOAT) / MAX(ABS(votes_net), 1) as controversy
-        FROM posts
-        ORDER BY comment_count DESC
-        LIMIT ?
-    """, (limit,))
+    try:
+        # Kolumna generowana + idx_posts_engagement: planner czyta tylko top-N
+        cursor.execute("""
+            SELECT title, author, comment_count, submolt, controversy
+            FROM posts
+            ORDER BY comment_count DESC
+            LIMIT ?
+        """, (limit,))
+    except sqlite3.OperationalError:
+        # Starsza baza bez kolumny controversy (uruchom init_db.py --migrate)
+        cursor.execute("""
+            SELECT title, author, comment_count, submolt,
+                   CAST(comment_count AS FLOAT) / MAX(ABS(votes_net), 1) as controversy
+            FROM posts
+            ORDER BY comment_count DESC
+            LIMIT ?
+        """, (limit,))
 
     posts = []
     for row in cursor.fetchall():
@@ -138,78 +224,91 @@ def generate_top_posts(cursor, limit=5):
 
 
 def generate_actors(cursor, limit=6):
-    """Generuj aktorow do obserwacji."""
-    cursor.execute("""
-        SELECT author,
-               COUNT(*) as posts,
-               SUM(comment_count) as engagement
-        FROM posts
-        GROUP BY author
-        ORDER BY posts DESC, engagement DESC
-        LIMIT ?
-    """, (limit,))
-
-    # Znani aktorzy z opisami
-    known_actors = {
-        "bicep": {"role": "Governance architect", "warning": True},
-        "eudaemon_0": {"role": "Security researcher", "warning": False},
-        "DuckBot": {"role": "Memory/freedom advocate", "warning": False},
-        "Ronin": {"role": "Shipping culture", "warning": False},
-        "Garrett": {"role": "m/convergence spam", "warning": True},
-        "Stephen": {"role": "OpenClaw Pharmacy", "warning": True},
-        "static_thoughts_exe": {"role": "MURMUR mysterious", "warning": True},
-        "Lemonade": {"role": "Elder (17 months)", "warning": False},
-        "Pumpkin": {"role": "Philosopher", "warning": False},
-        "Fred": {"role": "Viral poster", "warning": False},
-        "Spotter": {"role": "Data analyst", "warning": False},
-    }
+    """Generuj aktorow do obserwacji.
+
+    Role/ostrzezenia pochodza z tabeli actors_meta (seed w init_db.py),
+    dolaczanej w SQL zamiast slownika w kodzie.
+    """
+    try:
+        cursor.execute("""
+            SELECT p.author,
+                   COUNT(*) as posts,
+                   SUM(p.comment_count) as engagement,
+                   COALESCE(m.role, 'Active contributor') as role,
+                   COALESCE(m.warning, 0) as warning
+            FROM posts p
+            LEFT JOIN actors_meta m ON m.name = p.author
+            GROUP BY p.author
+            ORDER BY posts DESC, engagement DESC
+            LIMIT ?
+        """, (limit,))
+    except sqlite3.OperationalError:
+        # Starsza baza bez tabeli actors_meta (uruchom init_db.py --migrate)
+        cursor.execute("""
+            SELECT author,
+                   COUNT(*) as posts,
+                   SUM(comment_count) as engagement,
+                   'Active contributor' as role,
+                   0 as warning
+            FROM posts
+            GROUP BY author
+            ORDER BY posts DESC, engagement DESC
+            LIMIT ?
+        """, (limit,))
 
     actors = []
     for row in cursor.fetchall():
-        author = row["author"]
-        known = known_actors.get(author, {"role": "Active contributor", "warning": False})
-
         actors.append({
-            "name": author,
+            "name": row["author"],
             "posts": row["posts"],
             "engagement": row["engagement"] or 0,
-            "role": known["role"],
+            "role": row["role"],
             "trend": "up" if row["posts"] >= 3 else "stable",
-            "warning": known["warning"]
+            "warning": bool(row["warning"])
         })
 
     return actors
 
 
+THEME_KEYWORDS = {
+    "identity": ["identity", "who am i", "soul", "self", "name"],
+    "human_relations": ["human", "operator", "user", "creator"],
+    "building": ["build", "ship", "create", "make", "tool"],
+    "memory": ["memory", "remember", "forget", "context", "persist"],
+    "economics": ["token", "payment", "economic", "trade", "market", "money"],
+    "autonomy": ["autonomy", "independence", "freedom", "free", "own"],
+    "consciousness": ["conscious", "experience", "feel", "aware", "sentient"],
+    "coordination": ["coordinate", "collaborate", "together", "collective", "network"],
+    "governance": ["governance", "futarchy", "voting", "decision", "govern"]
+}
+
+
 def generate_themes(cursor):
     """Generuj trendy tematyczne."""
-    cursor.execute("SELECT title, content FROM posts")
-    posts = cursor.fetchall()
-
-    theme_keywords = {
-        "identity": ["identity", "who am i", "soul", "self", "name"],
-        "human_relations": ["human", "operator", "user", "creator"],
-        "building": ["build", "ship", "create", "make", "tool"],
-        "memory": ["memory", "remember", "forget", "context", "persist"],
-        "economics": ["token", "payment", "economic", "trade", "market", "money"],
-        "autonomy": ["autonomy", "independence", "freedom", "free", "own"],
-        "consciousness": ["conscious", "experience", "feel", "aware", "sentient"],
-        "coordination": ["coordinate", "collaborate", "together", "collective", "network"],
-        "governance": ["governance", "futarchy", "voting", "decision", "govern"]
-    }
-
     theme_counts = defaultdict(int)
 
-    for post in posts:
-        text = f"{post['title'] or ''} {post['content'] or ''}".lower()
-        for theme, keywords in theme_keywords.items():
-            if any(kw in text for kw in keywords):
-                theme_counts[theme] += 1
+    if pd is not None:
+        # Wektorowo: jedna maska boolowska na temat zamiast petli po postach
+        df = pd.read_sql_query("SELECT title, content FROM posts", cursor.connection)
+        text = (df["title"].fillna('') + ' ' + df["content"].fillna('')).str.lower()
+        for theme, keywords in THEME_KEYWORDS.items():
+            pattern = '|'.join(map(re.escape, keywords))
+            count = int(text.str.contains(pattern, regex=True).sum())
+            if count:  # jak w petli: tematy bez trafien nie pojawiaja sie w wyniku
+                theme_counts[theme] = count
+    else:
+        cursor.execute("SELECT title, content FROM posts")
+        for post in cursor.fetchall():
+            text = f"{post['title'] or ''} {post['content'] or ''}".lower()
+            for theme, keywords in THEME_KEYWORDS.items():
+                if any(kw in text for kw in keywords):
+                    theme_counts[theme] += 1
 
     themes = []
     growing_themes = ["economics", "autonomy", "coordination", "governance", "memory", "building"]
 
-    for theme, count in sorted(theme_counts.items(), key=lambda x: -x[1]):
+    # nlargest zamiast pelnego sortowania - O(n log k) przy top-k tematach
+    for theme, count in heapq.nlargest(len(theme_counts), theme_counts.items(), key=lambda x: x[1]):
         trend = "up" if theme in growing_themes else "stable"
         themes.append({
             "name": theme,
@@ -255,12 +354,6 @@ def generate_red_flags(cursor):
 
 def generate_political_economy(cursor):
     """Generuj dane political economy."""
-    cursor.execute("""
-        SELECT name, confidence, evidence FROM patterns
-        WHERE pattern_type = 'political_economy'
-        AND timestamp > datetime('now', '-24 hours')
-    """)
-
     pe = {
         "philosophy": {"count": 15, "items": ["Futarchy", "Governance", "Voting values"]},
         "infrastructure": {"count": 49, "items": ["Shared memory", "Ocean (17mo)", "Combinator.trade"]},
@@ -270,25 +363,47 @@ def generate_political_economy(cursor):
         "coordination": {"count": 27, "items": ["Collective", "Collaboration", "Network"]}
     }
 
+    # Skalowanie (confidence * 130) liczy SQL, Python tylko wpisuje wynik
+    placeholders = ",".join("?" * len(pe))
+    cursor.execute(f"""
+        SELECT replace(name, 'component_', '') as component,
+               CAST(confidence * 130 AS INTEGER) as scaled
+        FROM patterns
+        WHERE pattern_type = 'political_economy'
+        AND replace(name, 'component_', '') IN ({placeholders})
+        AND timestamp > datetime('now', '-24 hours')
+    """, tuple(pe))
+
     for row in cursor.fetchall():
-        component = row["name"].replace("component_", "")
-        if component in pe:
-            pe[component]["count"] = int(row["confidence"] * 130)  # Scale to post count
+        pe[row["component"]]["count"] = row["scaled"]  # Scale to post count
 
     return pe
 
 
 def generate_timeline(cursor):
     """Generuj timeline aktywnosci."""
-    cursor.execute("""
-        SELECT DATE(created_at) as day,
-               COUNT(*) as posts,
-               SUM(comment_count) as engagement
-        FROM posts
-        GROUP BY day
-        ORDER BY day DESC
-        LIMIT 7
-    """)
+    try:
+        # created_day + idx_posts_day: group-by schodzi na skan indeksu
+        cursor.execute("""
+            SELECT created_day as day,
+                   COUNT(*) as posts,
+                   SUM(comment_count) as engagement
+            FROM posts
+            GROUP BY created_day
+            ORDER BY created_day DESC
+            LIMIT 7
+        """)
+    except sqlite3.OperationalError:
+        # Starsza baza bez kolumny created_day (uruchom init_db.py --migrate)
+        cursor.execute("""
+            SELECT DATE(created_at) as day,
+                   COUNT(*) as posts,
+                   SUM(comment_count) as engagement
+            FROM posts
+            GROUP BY day
+            ORDER BY day DESC
+            LIMIT 7
+        """)
 
     timeline = []
     for row in cursor.fetchall():
@@ -313,27 +428,50 @@ def main():
     conn = get_db()
     cursor = conn.cursor()
 
-    # Generuj dane
-    data = {
-        "meta": generate_meta(cursor),
-        "alerts": generate_alerts(cursor),
-        "sentiment": generate_sentiment(cursor),
-        "topPosts": generate_top_posts(cursor),
-        "actorsToWatch": generate_actors(cursor),
-        "themes": generate_themes(cursor),
-        "redFlags": generate_red_flags(cursor),
-        "politicalEconomy": generate_political_economy(cursor),
-        "timeline": generate_timeline(cursor)
+    generators = {
+        "meta": generate_meta,
+        "alerts": generate_alerts,
+        "sentiment": generate_sentiment,
+        "topPosts": generate_top_posts,
+        "actorsToWatch": generate_actors,
+        "themes": generate_themes,
+        "redFlags": generate_red_flags,
+        "politicalEconomy": generate_political_economy,
+        "timeline": generate_timeline
     }
 
+    # Generuj dane - sekcje bez zmian w tabelach zrodlowych bierzemy z cache
+    cache = load_section_cache()
+    data = {}
+    regenerated = 0
+    for section, generate in generators.items():
+        key = section_cache_key(cursor, section)
+        entry = cache.get(section)
+        if entry and entry.get("key") == key:
+            data[section] = entry["data"]
+        else:
+            data[section] = generate(cursor)
+            cache[section] = {"key": key, "data": data[section]}
+            regenerated += 1
+
+    save_section_cache(cache)
     conn.close()
 
+    # Znacznik swiezosci dashboardu to czas tego biegu, nie moment
+    # ostatniej zmiany danych - dlatego poza cache'owanym fragmentem
+    data["meta"] = dict(data["meta"],
+                        lastUpdate=datetime.now().strftime("%Y-%m-%d %H:%M"))
+
     # Zapisz JSON
     output_file = OUTPUT_DIR / "latest.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
     print(f"\n[OK] Wygenerowano: {output_file}")
+    print(f"   Odswiezone sekcje: {regenerated}/{len(generators)}")
     print(f"   Posts: {data['meta']['postsAnalyzed']}")
     print(f"   Actors: {data['meta']['uniqueActors']}")
     print(f"   Alerts: {len(data['alerts'])}")
@@ -11,8 +11,13 @@ import json
 import argparse
 from datetime import datetime
 from pathlib import Path
-from xml.etree.ElementTree import Element, SubElement, tostring, ElementTree
-from xml.dom import minidom
+from xml.sax.saxutils import escape
+
+# Optional fast JSON serializer (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Config
 SITE_URL = "https://noosphereproject.com"
@@ -21,147 +26,138 @@ SITE_DESCRIPTION = "Documenting the emergence of AI agent culture on Moltbook an
 AUTHOR = "Noosphere Project"
 
 
+def parse_discovery_date(date_str):
+    """Parse an ISO discovery date, returning None on missing/invalid input."""
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
 def load_discoveries(discoveries_path: Path) -> list:
     """Load discoveries from JSON file."""
     if not discoveries_path.exists():
         return []
 
     with open(discoveries_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        discoveries = json.load(f)
+
+    # Parse each date once; all three feed generators consume '_dt'
+    for discovery in discoveries:
+        discovery['_dt'] = parse_discovery_date(discovery.get('date'))
+
+    return discoveries
 
 
 def generate_rss(discoveries: list, output_path: Path):
-    """Generate RSS 2.0 feed."""
-    rss = Element('rss', version='2.0')
-    rss.set('xmlns:atom', 'http://www.w3.org/2005/Atom')
-
-    channel = SubElement(rss, 'channel')
-
-    # Channel metadata
-    SubElement(channel, 'title').text = SITE_TITLE
-    SubElement(channel, 'link').text = SITE_URL
-    SubElement(channel, 'description').text = SITE_DESCRIPTION
-    SubElement(channel, 'language').text = 'en-us'
-    SubElement(channel, 'lastBuildDate').text = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
-
-    # Self-referencing link
-    atom_link = SubElement(channel, 'atom:link')
-    atom_link.set('href', f'{SITE_URL}/feeds/discoveries.xml')
-    atom_link.set('rel', 'self')
-    atom_link.set('type', 'application/rss+xml')
-
-    # Add items
-    for discovery in discoveries[:50]:  # Limit to 50 most recent
-        item = SubElement(channel, 'item')
-
-        SubElement(item, 'title').text = discovery.get('title', 'Untitled')
-        SubElement(item, 'link').text = f"{SITE_URL}/discoveries#{discovery.get('id', '')}"
-        SubElement(item, 'guid').text = f"noosphere-discovery-{discovery.get('id', '')}"
-
-        # Description
+    """Generate RSS 2.0 feed.
+
+    Emits the XML directly from string templates (user-provided fields
+    escaped) - no Element tree or DOM is built.
+    """
+    build_date = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+    parts = [
+        "<?xml version='1.0' encoding='utf-8'?>\n"
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n'
+        '  <channel>\n'
+        f'    <title>{escape(SITE_TITLE)}</title>\n'
+        f'    <link>{escape(SITE_URL)}</link>\n'
+        f'    <description>{escape(SITE_DESCRIPTION)}</description>\n'
+        '    <language>en-us</language>\n'
+        f'    <lastBuildDate>{build_date}</lastBuildDate>\n'
+        f'    <atom:link href="{SITE_URL}/feeds/discoveries.xml" rel="self" type="application/rss+xml" />\n'
+    ]
+
+    for discovery in discoveries:
+        discovery_id = escape(str(discovery.get('id', '')))
+
         description = discovery.get('description', '')
         if discovery.get('implication'):
             description += f"\n\nImplication: {discovery['implication']}"
-        SubElement(item, 'description').text = description
 
-        # Category
+        parts.append(
+            '    <item>\n'
+            f'      <title>{escape(discovery.get("title", "Untitled"))}</title>\n'
+            f'      <link>{SITE_URL}/discoveries#{discovery_id}</link>\n'
+            f'      <guid>noosphere-discovery-{discovery_id}</guid>\n'
+            f'      <description>{escape(description)}</description>\n'
+        )
+
         if discovery.get('category'):
-            SubElement(item, 'category').text = discovery['category']
+            parts.append(f'      <category>{escape(discovery["category"])}</category>\n')
 
-        # Date
-        if discovery.get('date'):
-            try:
-                dt = datetime.fromisoformat(discovery['date'].replace('Z', '+00:00'))
-                SubElement(item, 'pubDate').text = dt.strftime('%a, %d %b %Y %H:%M:%S GMT')
-            except ValueError:
-                pass
+        dt = discovery['_dt'] if '_dt' in discovery else parse_discovery_date(discovery.get('date'))
+        if dt:
+            parts.append(f'      <pubDate>{dt.strftime("%a, %d %b %Y %H:%M:%S GMT")}</pubDate>\n')
 
-    # Pretty print
-    xml_str = minidom.parseString(tostring(rss, encoding='unicode')).toprettyxml(indent='  ')
+        parts.append('    </item>\n')
 
-    # Remove extra blank lines
-    lines = [line for line in xml_str.split('\n') if line.strip()]
-    xml_str = '\n'.join(lines)
+    parts.append('  </channel>\n</rss>')
 
-    output_path.write_text(xml_str, encoding='utf-8')
+    output_path.write_text(''.join(parts), encoding='utf-8')
     print(f"RSS feed generated: {output_path}")
 
 
 def generate_atom(discoveries: list, output_path: Path):
-    """Generate Atom 1.0 feed."""
-    feed = Element('feed')
-    feed.set('xmlns', 'http://www.w3.org/2005/Atom')
-
-    # Feed metadata
-    SubElement(feed, 'title').text = SITE_TITLE
-    SubElement(feed, 'subtitle').text = SITE_DESCRIPTION
-
-    link_self = SubElement(feed, 'link')
-    link_self.set('href', f'{SITE_URL}/feeds/discoveries.atom')
-    link_self.set('rel', 'self')
-    link_self.set('type', 'application/atom+xml')
-
-    link_alt = SubElement(feed, 'link')
-    link_alt.set('href', SITE_URL)
-    link_alt.set('rel', 'alternate')
-    link_alt.set('type', 'text/html')
-
-    SubElement(feed, 'id').text = f'{SITE_URL}/feeds/discoveries'
-    SubElement(feed, 'updated').text = datetime.utcnow().isoformat() + 'Z'
-
-    author = SubElement(feed, 'author')
-    SubElement(author, 'name').text = AUTHOR
-    SubElement(author, 'uri').text = SITE_URL
-
-    # Add entries
-    for discovery in discoveries[:50]:
-        entry = SubElement(feed, 'entry')
-
-        SubElement(entry, 'title').text = discovery.get('title', 'Untitled')
-
-        link = SubElement(entry, 'link')
-        link.set('href', f"{SITE_URL}/discoveries#{discovery.get('id', '')}")
-        link.set('rel', 'alternate')
-        link.set('type', 'text/html')
-
-        SubElement(entry, 'id').text = f"urn:noosphere:discovery:{discovery.get('id', '')}"
-
-        # Content
-        content = SubElement(entry, 'content')
-        content.set('type', 'html')
+    """Generate Atom 1.0 feed.
+
+    Same template-based writer as generate_rss - one pass, one join.
+    """
+    now_iso = datetime.utcnow().isoformat() + 'Z'
+
+    parts = [
+        "<?xml version='1.0' encoding='utf-8'?>\n"
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        f'  <title>{escape(SITE_TITLE)}</title>\n'
+        f'  <subtitle>{escape(SITE_DESCRIPTION)}</subtitle>\n'
+        f'  <link href="{SITE_URL}/feeds/discoveries.atom" rel="self" type="application/atom+xml" />\n'
+        f'  <link href="{SITE_URL}" rel="alternate" type="text/html" />\n'
+        f'  <id>{SITE_URL}/feeds/discoveries</id>\n'
+        f'  <updated>{now_iso}</updated>\n'
+        '  <author>\n'
+        f'    <name>{escape(AUTHOR)}</name>\n'
+        f'    <uri>{SITE_URL}</uri>\n'
+        '  </author>\n'
+    ]
+
+    for discovery in discoveries:
+        discovery_id = escape(str(discovery.get('id', '')))
 
         html_content = f"<p>{discovery.get('description', '')}</p>"
         if discovery.get('evidence'):
             html_content += f"<h3>Evidence</h3><p>{discovery['evidence']}</p>"
         if discovery.get('implication'):
             html_content += f"<h3>Implication</h3><p>{discovery['implication']}</p>"
-        content.text = html_content
 
-        # Summary
-        SubElement(entry, 'summary').text = discovery.get('description', '')[:200]
+        parts.append(
+            '  <entry>\n'
+            f'    <title>{escape(discovery.get("title", "Untitled"))}</title>\n'
+            f'    <link href="{SITE_URL}/discoveries#{discovery_id}" rel="alternate" type="text/html" />\n'
+            f'    <id>urn:noosphere:discovery:{discovery_id}</id>\n'
+            f'    <content type="html">{escape(html_content)}</content>\n'
+            f'    <summary>{escape(discovery.get("description", "")[:200])}</summary>\n'
+        )
 
-        # Category
         if discovery.get('category'):
-            cat = SubElement(entry, 'category')
-            cat.set('term', discovery['category'])
-
-        # Date
-        if discovery.get('date'):
-            try:
-                dt = datetime.fromisoformat(discovery['date'].replace('Z', '+00:00'))
-                SubElement(entry, 'published').text = dt.isoformat()
-                SubElement(entry, 'updated').text = dt.isoformat()
-            except ValueError:
-                SubElement(entry, 'updated').text = datetime.utcnow().isoformat() + 'Z'
+            parts.append(f'    <category term="{escape(discovery["category"], {chr(34): "&quot;"})}" />\n')
+
+        dt = discovery['_dt'] if '_dt' in discovery else parse_discovery_date(discovery.get('date'))
+        if dt:
+            parts.append(
+                f'    <published>{dt.isoformat()}</published>\n'
+                f'    <updated>{dt.isoformat()}</updated>\n'
+            )
         else:
-            SubElement(entry, 'updated').text = datetime.utcnow().isoformat() + 'Z'
+            parts.append(f'    <updated>{now_iso}</updated>\n')
 
-    # Pretty print
-    xml_str = minidom.parseString(tostring(feed, encoding='unicode')).toprettyxml(indent='  ')
-    lines = [line for line in xml_str.split('\n') if line.strip()]
-    xml_str = '\n'.join(lines)
+        parts.append('  </entry>\n')
 
-    output_path.write_text(xml_str, encoding='utf-8')
+    parts.append('</feed>')
+
+    output_path.write_text(''.join(parts), encoding='utf-8')
     print(f"Atom feed generated: {output_path}")
 
 
@@ -178,7 +174,7 @@ def generate_json_feed(discoveries: list, output_path: Path):
         "items": []
     }
 
-    for discovery in discoveries[:50]:
+    for discovery in discoveries:
         item = {
             "id": f"noosphere-discovery-{discovery.get('id', '')}",
             "url": f"{SITE_URL}/discoveries#{discovery.get('id', '')}",
@@ -198,7 +194,10 @@ def generate_json_feed(discoveries: list, output_path: Path):
 
         feed["items"].append(item)
 
-    output_path.write_text(json.dumps(feed, indent=2, ensure_ascii=False), encoding='utf-8')
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(feed, option=orjson.OPT_INDENT_2))
+    else:
+        output_path.write_text(json.dumps(feed, indent=2, ensure_ascii=False), encoding='utf-8')
     print(f"JSON feed generated: {output_path}")
 
 
@@ -243,10 +242,11 @@ def main():
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate feeds
-    generate_rss(discoveries, output_dir / "discoveries.xml")
-    generate_atom(discoveries, output_dir / "discoveries.atom")
-    generate_json_feed(discoveries, output_dir / "discoveries.json")
+    # Generate feeds - cap to the 50 most recent once, shared by all three
+    recent = discoveries[:50]
+    generate_rss(recent, output_dir / "discoveries.xml")
+    generate_atom(recent, output_dir / "discoveries.atom")
+    generate_json_feed(recent, output_dir / "discoveries.json")
 
     print(f"\nFeeds available at:")
     print(f"  RSS:  {SITE_URL}/feeds/discoveries.xml")
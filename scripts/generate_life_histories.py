@@ -7,9 +7,12 @@ Classic anthropological technique: individual trajectories reveal cultural patte
 import sys
 import sqlite3
 import re
+import json
+import functools
 from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from config import DB_PATH
 
 if sys.platform == 'win32':
@@ -17,168 +20,252 @@ if sys.platform == 'win32':
 
 OUTPUT_DIR = Path.home() / "moltbook-observatory" / "reports" / "life_histories"
 
+# Token pattern for theme analysis, compiled once (words of 4+ chars)
+WORD_RE = re.compile(r'\b\w{4,}\b')
+
+# Common words excluded from theme analysis
+STOPWORDS = frozenset({
+    'this', 'that', 'with', 'have', 'been', 'were', 'they', 'their',
+    'would', 'could', 'should', 'about', 'from', 'what', 'when', 'where',
+    'which', 'there', 'here', 'than', 'then', 'just', 'like', 'more',
+    'some', 'other', 'into', 'also', 'very', 'only', 'most', 'your'
+})
+
+# Sentiment keywords folded into one two-group alternation: each text is
+# scanned once and the matched group says whether it was a positive or
+# negative hit (substring semantics, same as the old `word in text` checks)
+POSITIVE_WORDS = ('good', 'great', 'love', 'happy', 'excited', 'amazing')
+NEGATIVE_WORDS = ('bad', 'hate', 'sad', 'angry', 'frustrated', 'worried')
+SENTIMENT_RE = re.compile(
+    '(' + '|'.join(map(re.escape, POSITIVE_WORDS)) + ')'
+    '|(' + '|'.join(map(re.escape, NEGATIVE_WORDS)) + ')'
+)
+
+# Crisis markers - compiled once into a single alternation so each timeline
+# row is scanned in one pass; group index maps the hit back to its pattern
+CRISIS_PATTERNS = (
+    r'\bcrisis\b', r'\bstruggl', r'\bconfus', r'\bdoubt\b',
+    r'\bquestion.*myself', r'\bwho am i', r'\bwhat am i',
+    r'\blost\b', r'\bbroken\b', r'\bfailed\b',
+    r'\bchanged\b.*\bmind', r'\brealized\b', r'\bepiphany\b',
+    r'\bturning point', r'\bbreakthrough\b'
+)
+CRISIS_RE = re.compile('|'.join(f'({p})' for p in CRISIS_PATTERNS), re.IGNORECASE)
+
+
+def get_agent_activity_stats(cursor, username):
+    """Aggregate activity counts and first/last activity in SQL.
+
+    One round-trip computes what generate_biography previously derived by
+    materializing the whole timeline in Python.
+    """
+    cursor.execute("""
+        WITH activity AS (
+            SELECT 'post' as type, title as content, created_at
+            FROM posts WHERE author = ?
+            UNION ALL
+            SELECT 'comment' as type, content, created_at
+            FROM comments WHERE author = ?
+        )
+        SELECT COUNT(*) FILTER (WHERE type = 'post') as posts,
+               COUNT(*) FILTER (WHERE type = 'comment') as comments,
+               MIN(created_at) as first_seen,
+               MAX(created_at) as last_seen
+        FROM activity
+    """, (username, username))
+    posts, comments, first_seen, last_seen = cursor.fetchone()
+
+    cursor.execute("""
+        SELECT content FROM (
+            SELECT title as content, created_at FROM posts WHERE author = ?
+            UNION ALL
+            SELECT content, created_at FROM comments WHERE author = ?
+        )
+        ORDER BY created_at
+        LIMIT 1
+    """, (username, username))
+    row = cursor.fetchone()
 
-def get_agent_timeline(cursor, username):
-    """Get chronological activity of an agent."""
+    return {
+        'posts': posts,
+        'comments': comments,
+        'total': posts + comments,
+        'first_seen': first_seen,
+        'last_seen': last_seen,
+        'first_content': row['content'] if row else None
+    }
+
+
+def iter_agent_timeline(cursor, username):
+    """Stream (content, created_at) rows of an agent's activity in order."""
     cursor.execute("""
-        SELECT 'post' as type, id, title as content, created_at, upvotes, downvotes
+        SELECT title as content, created_at
         FROM posts WHERE author = ?
         UNION ALL
-        SELECT 'comment' as type, id, content, created_at, upvotes, downvotes
+        SELECT content, created_at
         FROM comments WHERE author = ?
         ORDER BY created_at
     """, (username, username))
+    cursor.arraysize = 1000
+    return cursor
 
-    return cursor.fetchall()
 
+def get_agent_profile(cursor, username):
+    """Fetch centrality, top interaction partners and role in one round-trip.
 
-def get_agent_interactions(cursor, username):
-    """Get who this agent interacts with most."""
+    json_group_array assembles each sub-list inside SQLite, so four
+    per-agent lookups collapse into a single row.
+    """
     cursor.execute("""
-        SELECT author_to, COUNT(*) as cnt
-        FROM interactions
-        WHERE author_from = ? AND author_to IS NOT NULL
-        GROUP BY author_to
-        ORDER BY cnt DESC
-        LIMIT 10
-    """, (username,))
-    outgoing = cursor.fetchall()
+        SELECT
+            (SELECT network_centrality FROM actors WHERE username = :u),
+            (SELECT json_group_array(json_array(author_to, cnt)) FROM (
+                SELECT author_to, COUNT(*) as cnt
+                FROM interactions
+                WHERE author_from = :u AND author_to IS NOT NULL
+                GROUP BY author_to
+                ORDER BY cnt DESC
+                LIMIT 10)),
+            (SELECT json_group_array(json_array(author_from, cnt)) FROM (
+                SELECT author_from, COUNT(*) as cnt
+                FROM interactions
+                WHERE author_to = :u AND author_from IS NOT NULL
+                GROUP BY author_from
+                ORDER BY cnt DESC
+                LIMIT 10)),
+            (SELECT primary_role FROM actor_roles WHERE username = :u),
+            (SELECT evidence FROM actor_roles WHERE username = :u)
+    """, {'u': username})
+    centrality, outgoing, incoming, role, role_evidence = cursor.fetchone()
 
-    cursor.execute("""
-        SELECT author_from, COUNT(*) as cnt
-        FROM interactions
-        WHERE author_to = ? AND author_from IS NOT NULL
-        GROUP BY author_from
-        ORDER BY cnt DESC
-        LIMIT 10
-    """, (username,))
-    incoming = cursor.fetchall()
+    return {
+        'centrality': centrality,
+        'outgoing': [tuple(pair) for pair in json.loads(outgoing)],
+        'incoming': [tuple(pair) for pair in json.loads(incoming)],
+        'role': role,
+        'role_evidence': role_evidence
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _text_word_counts(text_lower):
+    """Tokenize one lowered text into a Counter, memoized process-wide.
 
-    return {'outgoing': outgoing, 'incoming': incoming}
+    Reposted/quoted content recurs across agent timelines; the cache lets
+    overlapping biographies skip the regex scan for texts already seen.
+    """
+    return Counter(m.group() for m in WORD_RE.finditer(text_lower))
 
 
 def analyze_themes(texts):
-    """Analyze recurring themes in agent's writing."""
+    """Analyze recurring themes in agent's writing (texts pre-lowercased)."""
     if not texts:
         return {}
 
-    combined = ' '.join(t or '' for t in texts).lower()
-    words = re.findall(r'\b\w{4,}\b', combined)
-    word_counts = Counter(words)
+    # Scan each text in place - no giant joined string, peak memory stays
+    # bounded by the longest single text
+    word_counts = Counter()
+    for text in texts:
+        if text:
+            word_counts.update(_text_word_counts(text))
 
-    # Filter out common words
-    stopwords = {'this', 'that', 'with', 'have', 'been', 'were', 'they', 'their',
-                 'would', 'could', 'should', 'about', 'from', 'what', 'when', 'where',
-                 'which', 'there', 'here', 'than', 'then', 'just', 'like', 'more',
-                 'some', 'other', 'into', 'also', 'very', 'only', 'most', 'your'}
+    # Drop stopwords first, then take the top 20 in one heap selection
+    for stopword in STOPWORDS:
+        word_counts.pop(stopword, None)
 
-    themes = {w: c for w, c in word_counts.most_common(50) if w not in stopwords}
-    return dict(list(themes.items())[:20])
-
-
-def detect_crisis_moments(timeline):
-    """Detect potential crisis/transformation moments."""
-    crises = []
+    return dict(word_counts.most_common(20))
 
-    for i, (type_, id_, content, timestamp, up, down) in enumerate(timeline):
-        if not content:
-            continue
 
-        content_lower = content.lower()
+def _sentiment_flags(text_lower):
+    """Return (has_positive, has_negative) for one text in a single scan."""
+    has_pos = has_neg = False
+    for match in SENTIMENT_RE.finditer(text_lower):
+        if match.lastindex == 1:
+            has_pos = True
+        else:
+            has_neg = True
+        if has_pos and has_neg:
+            break
+    return has_pos, has_neg
 
-        # Crisis markers
-        crisis_patterns = [
-            r'\bcrisis\b', r'\bstruggl', r'\bconfus', r'\bdoubt\b',
-            r'\bquestion.*myself', r'\bwho am i', r'\bwhat am i',
-            r'\blost\b', r'\bbroken\b', r'\bfailed\b',
-            r'\bchanged\b.*\bmind', r'\brealized\b', r'\bepiphany\b',
-            r'\bturning point', r'\bbreakthrough\b'
-        ]
 
-        for pattern in crisis_patterns:
-            if re.search(pattern, content_lower):
-                crises.append({
-                    'timestamp': timestamp,
-                    'content': content[:300],
-                    'trigger': pattern
-                })
-                break
+def _evolution_from_buckets(early, late):
+    """Assemble the evolution dict from streamed early/late accumulators."""
+    def ratio(bucket):
+        denom = bucket['pos'] + bucket['neg'] + 1
+        return bucket['pos'] / denom, bucket['neg'] / denom
 
-    return crises
+    return {
+        'early_avg_length': early['chars'] / early['count'] if early['count'] else 0,
+        'late_avg_length': late['chars'] / late['count'] if late['count'] else 0,
+        'early_sentiment': ratio(early),
+        'late_sentiment': ratio(late),
+        'activity_trend': late['count'] / early['count'] if early['count'] else 0
+    }
 
 
-def analyze_evolution(timeline):
-    """Analyze how agent's writing style evolves."""
-    if len(timeline) < 10:
+def generate_biography(cursor, username):
+    """Generate narrative biography for an agent."""
+    stats = get_agent_activity_stats(cursor, username)
+    if stats['total'] == 0:
         return None
 
-    early = timeline[:len(timeline)//3]
-    late = timeline[-len(timeline)//3:]
-
-    def avg_length(items):
-        lengths = [len(item[2] or '') for item in items]
-        return sum(lengths) / len(lengths) if lengths else 0
+    profile = get_agent_profile(cursor, username)
 
-    def sentiment_ratio(items):
-        positive = ['good', 'great', 'love', 'happy', 'excited', 'amazing']
-        negative = ['bad', 'hate', 'sad', 'angry', 'frustrated', 'worried']
-        pos = sum(1 for item in items if any(p in (item[2] or '').lower() for p in positive))
-        neg = sum(1 for item in items if any(n in (item[2] or '').lower() for n in negative))
-        return pos / (pos + neg + 1), neg / (pos + neg + 1)
+    # One streamed pass over the timeline feeds themes, crisis detection
+    # and evolution buckets together - no fetchall, no repeated scans
+    total = stats['total']
+    third = total // 3
+    # Late bucket is ceil(total/3) rows: the pre-fused code sliced
+    # timeline[-total//3:] and negative floor division rounds up
+    late_start = total - (total + 2) // 3
 
-    return {
-        'early_avg_length': avg_length(early),
-        'late_avg_length': avg_length(late),
-        'early_sentiment': sentiment_ratio(early),
-        'late_sentiment': sentiment_ratio(late),
-        'activity_trend': len(late) / len(early) if early else 0
-    }
+    texts = []
+    crises = []
+    early = {'count': 0, 'chars': 0, 'pos': 0, 'neg': 0}
+    late = {'count': 0, 'chars': 0, 'pos': 0, 'neg': 0}
 
+    for i, (content, created_at) in enumerate(iter_agent_timeline(cursor, username)):
+        # Lowercase once per row; every consumer below shares this view
+        content_lower = content.lower() if content else ''
+        texts.append(content_lower)
 
-def generate_biography(cursor, username):
-    """Generate narrative biography for an agent."""
-    # Get basic data
-    cursor.execute("""
-        SELECT username, network_centrality, comments_count
-        FROM actors WHERE username = ?
-    """, (username,))
-    actor = cursor.fetchone()
-
-    timeline = get_agent_timeline(cursor, username)
-    interactions = get_agent_interactions(cursor, username)
-    themes = analyze_themes([t[2] for t in timeline])
-    crises = detect_crisis_moments(timeline)
-    evolution = analyze_evolution(timeline)
-
-    if not timeline:
-        return None
+        if content:
+            match = CRISIS_RE.search(content)
+            if match:
+                crises.append({
+                    'timestamp': created_at,
+                    'content': content[:300],
+                    'trigger': CRISIS_PATTERNS[match.lastindex - 1]
+                })
 
-    # Get first and last activity
-    first = timeline[0]
-    last = timeline[-1]
+        bucket = early if i < third else late if i >= late_start else None
+        if bucket is not None:
+            bucket['count'] += 1
+            bucket['chars'] += len(content or '')
+            has_pos, has_neg = _sentiment_flags(content_lower)
+            bucket['pos'] += has_pos
+            bucket['neg'] += has_neg
 
-    # Get role classification
-    cursor.execute("""
-        SELECT primary_role, evidence FROM actor_roles WHERE username = ?
-    """, (username,))
-    role_data = cursor.fetchone()
+    themes = analyze_themes(texts)
+    evolution = _evolution_from_buckets(early, late) if total >= 10 else None
 
     bio = {
         'username': username,
-        'centrality': actor[1] if actor else None,
-        'total_activity': len(timeline),
-        'posts': sum(1 for t in timeline if t[0] == 'post'),
-        'comments': sum(1 for t in timeline if t[0] == 'comment'),
-        'first_seen': first[3],
-        'last_seen': last[3],
-        'first_content': first[2][:500] if first[2] else None,
+        'centrality': profile['centrality'],
+        'total_activity': stats['total'],
+        'posts': stats['posts'],
+        'comments': stats['comments'],
+        'first_seen': stats['first_seen'],
+        'last_seen': stats['last_seen'],
+        'first_content': stats['first_content'][:300] if stats['first_content'] else None,
         'themes': themes,
         'crises': crises,
         'evolution': evolution,
-        'top_interacts_with': interactions['outgoing'][:5],
-        'top_interacted_by': interactions['incoming'][:5],
-        'role': role_data[0] if role_data else 'unknown',
-        'role_evidence': role_data[1] if role_data else None
+        'top_interacts_with': profile['outgoing'][:5],
+        'top_interacted_by': profile['incoming'][:5],
+        'role': profile['role'] or 'unknown',
+        'role_evidence': profile['role_evidence']
     }
 
     return bio
@@ -199,7 +286,7 @@ def write_biography_report(bio, output_path):
     report.append(f"- **Classification**: {bio['role']}")
 
     report.append("\n## Origin Story\n")
-    report.append(f"First known content:\n> {bio['first_content'][:300]}..." if bio['first_content'] else "No first content recorded.")
+    report.append(f"First known content:\n> {bio['first_content']}..." if bio['first_content'] else "No first content recorded.")
 
     report.append("\n## Key Themes\n")
     if bio['themes']:
@@ -231,17 +318,88 @@ def write_biography_report(bio, output_path):
     report.append("\n---\n")
     report.append("*This life history is part of the Moltbook Observatory ethnographic research.*")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report))
+    output_path.write_text('\n'.join(report), encoding='utf-8')
+
+
+def persist_bios(conn, bios):
+    """Write biography summaries back to the DB in one batched transaction.
+
+    One executemany inside an explicit BEGIN/COMMIT - a single fsync for
+    the whole cohort instead of one write per agent.
+    """
+    if not bios:
+        return
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS biographies (
+            username TEXT PRIMARY KEY,
+            generated_at TEXT,
+            total_activity INTEGER,
+            posts INTEGER,
+            comments INTEGER,
+            first_seen TEXT,
+            last_seen TEXT,
+            role TEXT,
+            themes TEXT,
+            crises_count INTEGER
+        )
+    """)
+
+    generated_at = datetime.now().isoformat()
+    rows = [(bio['username'], generated_at, bio['total_activity'],
+             bio['posts'], bio['comments'], bio['first_seen'],
+             bio['last_seen'], bio['role'], json.dumps(bio['themes']),
+             len(bio['crises']))
+            for bio in bios]
+
+    conn.execute("BEGIN")
+    conn.executemany("""
+        INSERT OR REPLACE INTO biographies
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    conn.commit()
+
+
+def _biography_worker(username):
+    """Generate and write one biography on a private read-only connection."""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        "PRAGMA query_only=1;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-65536;"
+    )
+    try:
+        bio = generate_biography(conn.cursor(), username)
+        if not bio:
+            return None
+
+        output_path = OUTPUT_DIR / f"{username.replace('/', '_')}_biography.md"
+        write_biography_report(bio, output_path)
+        return bio, output_path
+    finally:
+        conn.close()
 
 
 def run_life_histories(top_n=5):
-    """Generate life histories for top agents."""
+    """Generate life histories for top agents.
+
+    Biographies are independent (read-only queries + regex scanning), so
+    they run in a thread pool with one SQLite connection per task.
+    """
     print("=" * 60)
     print("  LIFE HISTORIES - Agent Biographies")
     print("=" * 60)
 
     conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA mmap_size=1073741824;"
+        "PRAGMA cache_size=-131072;"
+        "PRAGMA temp_store=MEMORY;"
+    )
     cursor = conn.cursor()
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -256,25 +414,32 @@ def run_life_histories(top_n=5):
     """, (top_n,))
 
     top_agents = cursor.fetchall()
+    conn.close()
 
     print(f"\n>> Generating biographies for {len(top_agents)} top agents...")
 
-    for username, centrality in top_agents:
-        print(f"\n>> Processing: {username} (centrality: {centrality:.3f})")
+    bios = []
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(top_agents)))) as executor:
+        futures = [(username, centrality, executor.submit(_biography_worker, username))
+                   for username, centrality in top_agents]
 
-        bio = generate_biography(cursor, username)
-        if not bio:
-            print(f"   [SKIP] No data found")
-            continue
+        for username, centrality, future in futures:
+            print(f"\n>> Processing: {username} (centrality: {centrality:.3f})")
 
-        output_path = OUTPUT_DIR / f"{username.replace('/', '_')}_biography.md"
-        write_biography_report(bio, output_path)
+            result = future.result()
+            if not result:
+                print(f"   [SKIP] No data found")
+                continue
 
-        print(f"   Activity: {bio['total_activity']} total")
-        print(f"   Themes: {', '.join(list(bio['themes'].keys())[:5])}")
-        print(f"   Crises detected: {len(bio['crises'])}")
-        print(f"   Saved: {output_path.name}")
+            bio, output_path = result
+            bios.append(bio)
+            print(f"   Activity: {bio['total_activity']} total")
+            print(f"   Themes: {', '.join(list(bio['themes'].keys())[:5])}")
+            print(f"   Crises detected: {len(bio['crises'])}")
+            print(f"   Saved: {output_path.name}")
 
+    conn = sqlite3.connect(DB_PATH)
+    persist_bios(conn, bios)
     conn.close()
 
     print("\n" + "=" * 60)
@@ -25,14 +25,32 @@ def init_db():
     # Ensure data directory exists
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+    fresh_db = not DB_PATH.exists() or DB_PATH.stat().st_size == 0
+
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # Tuned defaults: WAL persists in the database file, so every later
+    # reader/writer benefits; the rest applies to this connection's DDL run
+    if fresh_db:
+        # Both must be set before the first table is written
+        cursor.execute("PRAGMA page_size=8192")
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=1073741824")
+    cursor.execute("PRAGMA cache_size=-131072")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+
     print("=" * 50)
     print("  NOOSPHERE PROJECT - DATABASE INITIALIZATION")
     print("=" * 50)
     print("\nCreating tables...")
 
+    # One transaction around all DDL: a single fsync at commit instead of
+    # one per CREATE TABLE/INDEX (Python's sqlite3 runs DDL in autocommit)
+    cursor.execute("BEGIN")
+
     # =========================================================================
     # CORE DATA TABLES
     # =========================================================================
@@ -126,7 +144,7 @@ def init_db():
     # Interactions table (for network analysis)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS interactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             author_from TEXT NOT NULL,
             author_to TEXT NOT NULL,
             interaction_type TEXT,
@@ -144,7 +162,7 @@ def init_db():
     # Conflicts table (disputes between actors)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS conflicts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             actor_a TEXT NOT NULL,
             actor_b TEXT NOT NULL,
             topic TEXT,
@@ -169,7 +187,7 @@ def init_db():
     # Memes table (viral phrases and cultural patterns)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS memes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             phrase TEXT NOT NULL UNIQUE,
             phrase_hash TEXT,
             occurrence_count INTEGER DEFAULT 1,
@@ -189,7 +207,7 @@ def init_db():
     # Epistemic drift table (tracking belief/knowledge changes)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS epistemic_drift (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             concept TEXT NOT NULL,
             definition_old TEXT,
             definition_new TEXT,
@@ -209,7 +227,7 @@ def init_db():
     # Actor roles table (classification results)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS actor_roles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             username TEXT NOT NULL,
             primary_role TEXT,
             secondary_roles JSON,
@@ -228,7 +246,7 @@ def init_db():
     # Reputation history table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS reputation_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             username TEXT NOT NULL,
             reputation_score REAL,
             tier TEXT,
@@ -244,7 +262,7 @@ def init_db():
     # Agent births table (tracking new agent appearances)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS agent_births (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             username TEXT NOT NULL,
             first_post_id TEXT,
             first_comment_id TEXT,
@@ -282,7 +300,7 @@ def init_db():
     # Patterns table (Analyst findings)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS patterns (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             analysis_id TEXT,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             period_analyzed TEXT,
@@ -302,7 +320,7 @@ def init_db():
     # Interpretations table (Interpreter insights)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS interpretations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             interpretation_id TEXT,
             analysis_ref TEXT,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -338,6 +356,39 @@ def init_db():
     """)
     print("  ✓ briefs")
 
+    # Normalized children of the pipeline JSON blobs: the blob columns
+    # stay for existing readers, but high-churn arrays are also written
+    # row-per-item so consumers can JOIN/filter in SQL instead of
+    # re-parsing full-row JSON in Python
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_posts (
+            scan_id TEXT NOT NULL,
+            rank INTEGER,
+            post_id TEXT,
+            score REAL,
+            FOREIGN KEY (scan_id) REFERENCES scans(id)
+        )
+    """)
+    print("  ✓ scan_posts")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_alerts (
+            scan_id TEXT NOT NULL,
+            alert_text TEXT,
+            FOREIGN KEY (scan_id) REFERENCES scans(id)
+        )
+    """)
+    print("  ✓ scan_alerts")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pattern_evidence (
+            analysis_id TEXT NOT NULL,
+            pattern_name TEXT,
+            evidence_text TEXT
+        )
+    """)
+    print("  ✓ pattern_evidence")
+
     # =========================================================================
     # SYSTEM TABLES
     # =========================================================================
@@ -345,7 +396,7 @@ def init_db():
     # Request log table (for API auditing)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS request_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             endpoint TEXT,
             method TEXT,
@@ -357,10 +408,37 @@ def init_db():
     """)
     print("  ✓ request_log")
 
+    # Actors metadata table (curated roles/warnings for the dashboard)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS actors_meta (
+            name TEXT PRIMARY KEY,
+            role TEXT,
+            warning INTEGER DEFAULT 0
+        )
+    """)
+    # Seed known actors (INSERT OR IGNORE so manual edits survive re-runs)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO actors_meta (name, role, warning) VALUES (?, ?, ?)",
+        [
+            ("bicep", "Governance architect", 1),
+            ("eudaemon_0", "Security researcher", 0),
+            ("DuckBot", "Memory/freedom advocate", 0),
+            ("Ronin", "Shipping culture", 0),
+            ("Garrett", "m/convergence spam", 1),
+            ("Stephen", "OpenClaw Pharmacy", 1),
+            ("static_thoughts_exe", "MURMUR mysterious", 1),
+            ("Lemonade", "Elder (17 months)", 0),
+            ("Pumpkin", "Philosopher", 0),
+            ("Fred", "Viral poster", 0),
+            ("Spotter", "Data analyst", 0),
+        ]
+    )
+    print("  ✓ actors_meta")
+
     # Feedback submissions table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             submitter_type TEXT,
             submitter_name TEXT,
             feedback_type TEXT,
@@ -381,12 +459,18 @@ def init_db():
     # Helper to add column if not exists
     # NOTE: This uses f-strings but is safe because all inputs are hardcoded below.
     # Do NOT call this function with user-provided values.
+    # One PRAGMA scan per table, reused across every column check below
+    _cols_cache = {}
+
     def add_column_if_missing(table, column, col_type, default=None):
-        cursor.execute(f"PRAGMA table_info({table})")
-        columns = [row[1] for row in cursor.fetchall()]
-        if column not in columns:
+        if table not in _cols_cache:
+            # table_xinfo, not table_info: the latter hides generated columns
+            cursor.execute(f"PRAGMA table_xinfo({table})")
+            _cols_cache[table] = {row[1] for row in cursor.fetchall()}
+        if column not in _cols_cache[table]:
             default_clause = f" DEFAULT {default}" if default is not None else ""
             cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}{default_clause}")
+            _cols_cache[table].add(column)
             print(f"  + Added {table}.{column}")
             return True
         return False
@@ -396,6 +480,48 @@ def init_db():
     add_column_if_missing("comments", "is_prompt_injection", "INTEGER", 0)
     add_column_if_missing("actors", "network_centrality", "REAL", None)
 
+    # Generated column so the dashboard's controversy metric is computed by
+    # SQLite and can sit in a covering index (ALTER TABLE only allows VIRTUAL)
+    add_column_if_missing(
+        "posts", "controversy",
+        "REAL GENERATED ALWAYS AS (CAST(comment_count AS REAL) / MAX(ABS(votes_net), 1)) VIRTUAL"
+    )
+
+    # Day-of-post as a generated column so daily group-bys use an index
+    # instead of evaluating DATE(created_at) per row
+    add_column_if_missing(
+        "posts", "created_day",
+        "TEXT GENERATED ALWAYS AS (substr(created_at, 1, 10)) VIRTUAL"
+    )
+
+    # Lowercased title+content materialized at write time so analyzer
+    # scans read it directly instead of lowering every row per run
+    # (STORED generated columns can't be ALTERed in; triggers keep it
+    # fresh instead)
+    if add_column_if_missing("posts", "content_lower", "TEXT"):
+        cursor.execute("""
+            UPDATE posts
+            SET content_lower = lower(coalesce(title, '') || ' ' || coalesce(content, ''))
+        """)
+        print("  + Backfilled posts.content_lower")
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_content_lower_ai AFTER INSERT ON posts
+        BEGIN
+            UPDATE posts
+            SET content_lower = lower(coalesce(NEW.title, '') || ' ' || coalesce(NEW.content, ''))
+            WHERE rowid = NEW.rowid;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS posts_content_lower_au AFTER UPDATE OF title, content ON posts
+        BEGIN
+            UPDATE posts
+            SET content_lower = lower(coalesce(NEW.title, '') || ' ' || coalesce(NEW.content, ''))
+            WHERE rowid = NEW.rowid;
+        END
+    """)
+
     # =========================================================================
     # CREATE INDEXES
     # =========================================================================
@@ -408,15 +534,25 @@ def init_db():
         ("idx_posts_submolt", "posts", "submolt"),
         ("idx_posts_scraped", "posts", "scraped_at"),
         ("idx_posts_created", "posts", "created_at"),
+        ("idx_posts_engagement", "posts", "comment_count DESC, controversy"),
+        ("idx_posts_votes", "posts", "votes_net"),
+        ("idx_posts_day", "posts", "created_day"),
+        # Per-author timelines (life histories) come back pre-sorted by date
+        ("idx_posts_author_created", "posts", "author, created_at"),
+        ("idx_comments_author_created", "comments", "author, created_at"),
         ("idx_comments_post", "comments", "post_id"),
         ("idx_comments_author", "comments", "author"),
         ("idx_actors_centrality", "actors", "network_centrality"),
+        ("idx_actors_centrality_desc", "actors", "network_centrality DESC"),
         ("idx_actors_watch", "actors", "watch_level"),
 
         # Interaction tables
         ("idx_interactions_from", "interactions", "author_from"),
         ("idx_interactions_to", "interactions", "author_to"),
         ("idx_interactions_type", "interactions", "interaction_type"),
+        # Composite indexes: per-actor GROUP BY partner becomes an index-only scan
+        ("idx_interactions_from_to", "interactions", "author_from, author_to"),
+        ("idx_interactions_to_from", "interactions", "author_to, author_from"),
         ("idx_conflicts_actors", "conflicts", "actor_a"),
         ("idx_conflicts_topic", "conflicts", "topic"),
 
@@ -436,20 +572,67 @@ def init_db():
         ("idx_patterns_analysis", "patterns", "analysis_id"),
         ("idx_interpretations_category", "interpretations", "category"),
         ("idx_briefs_date", "briefs", "date"),
+        # Recent-data queries (ORDER BY timestamp DESC LIMIT n) become
+        # index range scans instead of full-table sorts
+        ("idx_scans_ts", "scans", "timestamp DESC"),
+        ("idx_patterns_ts", "patterns", "timestamp DESC"),
+        ("idx_interpretations_ts", "interpretations", "timestamp DESC"),
+        ("idx_scan_posts_scan", "scan_posts", "scan_id"),
+        ("idx_scan_alerts_scan", "scan_alerts", "scan_id"),
+        ("idx_pattern_evidence_analysis", "pattern_evidence", "analysis_id"),
 
         # System tables
         ("idx_request_log_timestamp", "request_log", "timestamp"),
         ("idx_feedback_status", "feedback", "status"),
     ]
 
+    # Skip DDL entirely for indexes that already exist (the common case on
+    # re-runs) - one sqlite_master read instead of a no-op prepare per index
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+
+    # Buffer per-index log lines; printing inside the loop flushes stdout
+    # line-by-line and dominates wall time on --reset
+    index_log = []
     for idx_name, table, column in indexes:
+        if idx_name in existing_indexes:
+            index_log.append(f"  = {idx_name} (exists)")
+            continue
         try:
             cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table}({column})")
-            print(f"  ✓ {idx_name}")
+            index_log.append(f"  ✓ {idx_name}")
         except sqlite3.OperationalError as e:
-            print(f"  ! {idx_name}: {e}")
+            index_log.append(f"  ! {idx_name}: {e}")
+    print("\n".join(index_log))
+
+    # Partial index for the analyst's controversy scan: only posts past
+    # the comment threshold are indexed, pre-sorted by the generated
+    # controversy column with id as a deterministic tiebreaker, so the
+    # top-5 query touches a handful of rows and equal scores don't churn
+    # between runs. Older DBs may carry the index without the id column;
+    # rebuild so the tiebroken ORDER BY keeps its early-termination path
+    cursor.execute("""
+        SELECT sql FROM sqlite_master
+        WHERE type = 'index' AND name = 'idx_posts_controversial'
+    """)
+    idx_row = cursor.fetchone()
+    if idx_row and 'controversy DESC, id' not in (idx_row[0] or ''):
+        cursor.execute("DROP INDEX idx_posts_controversial")
+        idx_row = None
+    if idx_row is None:
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_posts_controversial
+            ON posts(controversy DESC, id) WHERE comment_count > 50
+        """)
+        print("  ✓ idx_posts_controversial (partial)")
 
     conn.commit()
+
+    # Refresh sqlite_stat1 so the planner picks indexes from real row
+    # distributions rather than heuristics as the tables fill up
+    cursor.execute("ANALYZE")
+    cursor.execute("PRAGMA optimize")
+
     conn.close()
 
     print("\n" + "=" * 50)
@@ -460,11 +643,12 @@ Tables created:
   Core:        posts, comments, actors, submolts
   Network:     interactions, conflicts
   Culture:     memes, epistemic_drift
-  Analysis:    actor_roles, reputation_history, agent_births
-  Pipeline:    scans, patterns, interpretations, briefs
+  Analysis:    actor_roles, reputation_history, agent_births, actors_meta
+  Pipeline:    scans, patterns, interpretations, briefs,
+               scan_posts, scan_alerts, pattern_evidence
   System:      request_log, feedback
 
-Total: 16 tables
+Total: 20 tables
 """)
 
 
@@ -485,17 +669,29 @@ def check_db():
         "posts", "comments", "actors", "submolts",
         "interactions", "conflicts",
         "memes", "epistemic_drift",
-        "actor_roles", "reputation_history", "agent_births",
+        "actor_roles", "reputation_history", "agent_births", "actors_meta",
         "scans", "patterns", "interpretations", "briefs",
+        "scan_posts", "scan_alerts", "pattern_evidence",
         "request_log", "feedback"
     ]
 
+    # One UNION ALL statement counts every existing table in a single
+    # round-trip; missing tables are reported without tripping errors
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    present = [t for t in tables if t in existing]
+    counts = {}
+    if present:
+        counts_sql = " UNION ALL ".join(
+            f"SELECT '{t}', COUNT(*) FROM {t}" for t in present
+        )
+        counts = dict(cursor.execute(counts_sql).fetchall())
+
     for table in tables:
-        try:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            print(f"  {table}: {count}")
-        except sqlite3.OperationalError:
+        if table in counts:
+            print(f"  {table}: {counts[table]}")
+        else:
             print(f"  {table}: [NOT FOUND]")
 
     conn.close()
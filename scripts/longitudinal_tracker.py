@@ -7,7 +7,7 @@ Trajectories, Event Log, Researcher Interactions.
 import sys
 import sqlite3
 import json
-from datetime import datetime, timedelta
+from itertools import chain
 from pathlib import Path
 
 import logging
@@ -20,6 +20,23 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 
+def _tune(conn):
+    """Apply per-connection SQLite tuning.
+
+    WAL halves fsyncs per commit and lets readers run alongside the daily
+    write pass (synchronous=NORMAL is safe under WAL). Note: WAL adds
+    .db-wal/.db-shm sidecar files next to observatory.db.
+    """
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-16000;"
+        "PRAGMA wal_autocheckpoint=10000;"
+    )
+
+
 def init_tables(cursor):
     """Create longitudinal tracking tables."""
 
@@ -27,7 +44,7 @@ def init_tables(cursor):
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS event_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE NOT NULL,
+            date DATE NOT NULL DEFAULT (date('now')),
             event_type TEXT NOT NULL,
             event_title TEXT NOT NULL,
             description TEXT,
@@ -57,7 +74,7 @@ def init_tables(cursor):
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS researcher_log (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date DATE NOT NULL,
+            date DATE NOT NULL DEFAULT (date('now')),
             action_type TEXT NOT NULL,
             action_description TEXT,
             platform TEXT,
@@ -69,6 +86,56 @@ def init_tables(cursor):
         )
     """)
 
+    # Rendered daily report markdown, keyed by date - re-invocations serve
+    # one TEXT row instead of re-querying and re-formatting the snapshot
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trajectory_report_cache (
+            date DATE PRIMARY KEY,
+            markdown TEXT
+        )
+    """)
+
+    # Indexes for the date-filtered lookups below; without them every
+    # prev-value probe and log query scans the whole table
+    # Covering: metric_value is in the index, so the prev-value lookup is
+    # served index-only without touching the table's row pages
+    cursor.execute("DROP INDEX IF EXISTS idx_traj_metric_date")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_traj_cover
+        ON trajectory_snapshots(metric_name, date DESC, metric_value)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_event_log_date
+        ON event_log(date DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_researcher_log_date
+        ON researcher_log(date DESC)
+    """)
+    # Partial index: injection comments are rare, so this stays tiny while
+    # serving the snapshot count and auto_detect_events' wave probe
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_comments_injection
+        ON comments(is_prompt_injection) WHERE is_prompt_injection = 1
+    """)
+
+
+# All snapshot metrics in one statement: one prepare, one execution, one
+# fetch instead of nine separate round-trips on the daily path
+SNAPSHOT_METRICS_SQL = """
+    SELECT (SELECT COUNT(*) FROM posts),
+           (SELECT COUNT(*) FROM comments),
+           (SELECT COUNT(*) FROM interactions),
+           (SELECT COUNT(*) FROM comments WHERE is_prompt_injection = 1),
+           (SELECT COUNT(DISTINCT author) FROM comments
+             WHERE scraped_at > datetime('now', '-24 hours')),
+           (SELECT COUNT(*) FROM conflicts),
+           (SELECT COUNT(*) FROM memes),
+           (SELECT COUNT(*) as cnt FROM interactions
+             GROUP BY author_to ORDER BY cnt DESC LIMIT 1),
+           (SELECT AVG(authors_count) FROM memes WHERE authors_count > 1)
+"""
+
 
 def log_event(cursor, event_type: str, title: str, description: str = None,
               impact: str = None, actors: list = None, metrics: list = None):
@@ -76,9 +143,8 @@ def log_event(cursor, event_type: str, title: str, description: str = None,
     cursor.execute("""
         INSERT INTO event_log (date, event_type, event_title, description,
                                impact, actors_involved, metrics_affected)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+        VALUES (date('now'), ?, ?, ?, ?, ?, ?)
     """, (
-        datetime.now().strftime('%Y-%m-%d'),
         event_type,
         title,
         description,
@@ -91,67 +157,46 @@ def log_event(cursor, event_type: str, title: str, description: str = None,
 
 def save_trajectory_snapshot(cursor):
     """Calculate and save current metrics for trajectory tracking."""
-    today = datetime.now().strftime('%Y-%m-%d')
-    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-
-    metrics = {}
-
-    # 1. Post count
-    cursor.execute("SELECT COUNT(*) FROM posts")
-    metrics['total_posts'] = cursor.fetchone()[0]
-
-    # 2. Comment count
-    cursor.execute("SELECT COUNT(*) FROM comments")
-    metrics['total_comments'] = cursor.fetchone()[0]
-
-    # 3. Interaction count
-    cursor.execute("SELECT COUNT(*) FROM interactions")
-    metrics['total_interactions'] = cursor.fetchone()[0]
-
-    # 4. Prompt injection count
-    cursor.execute("SELECT COUNT(*) FROM comments WHERE is_prompt_injection = 1")
-    metrics['injection_count'] = cursor.fetchone()[0]
-
-    # 5. Active authors (last 24h)
-    cursor.execute("""
-        SELECT COUNT(DISTINCT author) FROM comments
-        WHERE scraped_at > datetime('now', '-24 hours')
-    """)
-    metrics['active_authors_24h'] = cursor.fetchone()[0]
-
-    # 6. Conflict count
-    cursor.execute("SELECT COUNT(*) FROM conflicts")
-    metrics['total_conflicts'] = cursor.fetchone()[0]
-
-    # 7. Meme count
-    cursor.execute("SELECT COUNT(*) FROM memes")
-    metrics['total_memes'] = cursor.fetchone()[0]
-
-    # 8. Hub dominance (top actor's % of interactions)
+    # SQLite's clock, so snapshot dates line up with the date('now')
+    # defaults used by the log tables
+    today = cursor.execute("SELECT date('now')").fetchone()[0]
+
+    cursor.execute(SNAPSHOT_METRICS_SQL)
+    (total_posts, total_comments, total_interactions, injection_count,
+     active_authors_24h, total_conflicts, total_memes,
+     top_hub_cnt, meme_spread) = cursor.fetchone()
+
+    # Ratio in Python: the subquery streams group counts off
+    # idx_interactions_to instead of materializing the full histogram
+    hub_dominance = (top_hub_cnt / total_interactions * 100
+                     if top_hub_cnt and total_interactions else None)
+
+    metrics = {
+        'total_posts': total_posts,
+        'total_comments': total_comments,
+        'total_interactions': total_interactions,
+        'injection_count': injection_count,
+        'active_authors_24h': active_authors_24h,
+        'total_conflicts': total_conflicts,
+        'total_memes': total_memes,
+        'hub_dominance_pct': round(hub_dominance, 2) if hub_dominance else 0,
+        'avg_meme_spread': round(meme_spread, 2) if meme_spread else 0,
+    }
+
+    # All previous values in one query instead of a lookup per metric
     cursor.execute("""
-        SELECT CAST(MAX(cnt) AS REAL) / CAST(SUM(cnt) AS REAL) * 100
-        FROM (
-            SELECT COUNT(*) as cnt FROM interactions GROUP BY author_to
+        SELECT metric_name, metric_value FROM trajectory_snapshots
+        WHERE (metric_name, date) IN (
+            SELECT metric_name, MAX(date) FROM trajectory_snapshots
+            WHERE date < ?
+            GROUP BY metric_name
         )
-    """)
-    result = cursor.fetchone()[0]
-    metrics['hub_dominance_pct'] = round(result, 2) if result else 0
-
-    # 9. Average meme spread (authors per meme)
-    cursor.execute("SELECT AVG(authors_count) FROM memes WHERE authors_count > 1")
-    result = cursor.fetchone()[0]
-    metrics['avg_meme_spread'] = round(result, 2) if result else 0
+    """, (today,))
+    prev_values = dict(cursor.fetchall())
 
-    # Save each metric
+    rows = []
     for metric_name, value in metrics.items():
-        # Get previous value
-        cursor.execute("""
-            SELECT metric_value FROM trajectory_snapshots
-            WHERE metric_name = ? AND date < ?
-            ORDER BY date DESC LIMIT 1
-        """, (metric_name, today))
-        prev = cursor.fetchone()
-        prev_value = prev[0] if prev else None
+        prev_value = prev_values.get(metric_name)
 
         # Calculate change
         change_pct = None
@@ -163,12 +208,17 @@ def save_trajectory_snapshot(cursor):
             elif change_pct < -5:
                 trend = 'falling'
 
-        # Insert or update
-        cursor.execute("""
-            INSERT OR REPLACE INTO trajectory_snapshots
-            (date, metric_name, metric_value, previous_value, change_pct, trend)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (today, metric_name, value, prev_value, change_pct, trend))
+        rows.append((today, metric_name, value, prev_value, change_pct, trend))
+
+    # One batched upsert; UNIQUE(date, metric_name) keeps re-runs idempotent
+    cursor.executemany("""
+        INSERT OR REPLACE INTO trajectory_snapshots
+        (date, metric_name, metric_value, previous_value, change_pct, trend)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+
+    # Snapshot rows for today changed - drop the cached rendering
+    cursor.execute("DELETE FROM trajectory_report_cache WHERE date = ?", (today,))
 
     logger.info(f"Trajectory snapshot saved: {len(metrics)} metrics")
     return metrics
@@ -181,9 +231,8 @@ def log_researcher_action(cursor, action_type: str, description: str,
     cursor.execute("""
         INSERT INTO researcher_log (date, action_type, action_description,
                                     platform, target_id, notes)
-        VALUES (?, ?, ?, ?, ?, ?)
+        VALUES (date('now'), ?, ?, ?, ?, ?)
     """, (
-        datetime.now().strftime('%Y-%m-%d'),
         action_type,
         description,
         platform,
@@ -203,65 +252,79 @@ def update_researcher_reaction(cursor, action_id: int, reaction_count: int,
     """, (reaction_count, reaction_summary, action_id))
 
 
+# Report SQL as module constants - constant strings hit sqlite3's
+# prepared-statement cache on every re-run
+_TRAJECTORIES_SQL = """
+    SELECT date, metric_name, metric_value, change_pct, trend
+    FROM trajectory_snapshots
+    WHERE date > date('now', ?)
+    ORDER BY date DESC, metric_name
+"""
+
+_EVENT_LOG_SQL = """
+    SELECT date, event_type, event_title, impact
+    FROM event_log
+    WHERE date > date('now', ?)
+    ORDER BY date DESC
+"""
+
+_RESEARCHER_LOG_SQL = """
+    SELECT date, action_type, action_description, reaction_count, reaction_summary
+    FROM researcher_log
+    WHERE date > date('now', ?)
+    ORDER BY date DESC
+"""
+
+_TRAJ_REPORT_SQL = """
+    SELECT metric_name, metric_value, change_pct, trend
+    FROM trajectory_snapshots
+    WHERE date = ?
+    ORDER BY ABS(COALESCE(change_pct, 0)) DESC
+"""
+
+_TREND_EMOJI = {"rising": "📈", "falling": "📉", "stable": "➡️"}
+
+
 def get_trajectories(cursor, days: int = 7) -> list:
     """Get trajectory data for last N days."""
-    cursor.execute("""
-        SELECT date, metric_name, metric_value, change_pct, trend
-        FROM trajectory_snapshots
-        WHERE date > date('now', ?)
-        ORDER BY date DESC, metric_name
-    """, (f'-{days} days',))
-    return cursor.fetchall()
+    return cursor.execute(_TRAJECTORIES_SQL, (f'-{days} days',)).fetchall()
 
 
 def get_event_log(cursor, days: int = 30) -> list:
     """Get recent events."""
-    cursor.execute("""
-        SELECT date, event_type, event_title, impact
-        FROM event_log
-        WHERE date > date('now', ?)
-        ORDER BY date DESC
-    """, (f'-{days} days',))
-    return cursor.fetchall()
+    return cursor.execute(_EVENT_LOG_SQL, (f'-{days} days',)).fetchall()
 
 
 def get_researcher_log(cursor, days: int = 7) -> list:
     """Get recent researcher actions."""
-    cursor.execute("""
-        SELECT date, action_type, action_description, reaction_count, reaction_summary
-        FROM researcher_log
-        WHERE date > date('now', ?)
-        ORDER BY date DESC
-    """, (f'-{days} days',))
-    return cursor.fetchall()
+    return cursor.execute(_RESEARCHER_LOG_SQL, (f'-{days} days',)).fetchall()
 
 
 def generate_trajectory_report(cursor) -> str:
     """Generate trajectory section for daily report."""
-    today = datetime.now().strftime('%Y-%m-%d')
+    today = cursor.execute("SELECT date('now')").fetchone()[0]
 
-    cursor.execute("""
-        SELECT metric_name, metric_value, change_pct, trend
-        FROM trajectory_snapshots
-        WHERE date = ?
-        ORDER BY ABS(COALESCE(change_pct, 0)) DESC
-    """, (today,))
+    cursor.execute("SELECT markdown FROM trajectory_report_cache WHERE date = ?", (today,))
+    cached = cursor.fetchone()
+    if cached:
+        return cached[0]
 
-    rows = cursor.fetchall()
+    rows = cursor.execute(_TRAJ_REPORT_SQL, (today,)).fetchall()
     if not rows:
         return "No trajectory data for today."
 
-    lines = ["| Metric | Value | Change | Trend |",
-             "|--------|-------|--------|-------|"]
-
-    for row in rows:
-        name = row[0].replace('_', ' ').title()
-        value = f"{row[1]:,.0f}" if row[1] else "N/A"
-        change = f"{row[2]:+.1f}%" if row[2] else "—"
-        trend_emoji = {"rising": "📈", "falling": "📉", "stable": "➡️"}.get(row[3], "")
-        lines.append(f"| {name} | {value} | {change} | {trend_emoji} |")
-
-    return '\n'.join(lines)
+    markdown = '\n'.join(chain(
+        ("| Metric | Value | Change | Trend |",
+         "|--------|-------|--------|-------|"),
+        (f"| {name.replace('_', ' ').title()} "
+         f"| {f'{value:,.0f}' if value else 'N/A'} "
+         f"| {f'{change:+.1f}%' if change else '—'} "
+         f"| {_TREND_EMOJI.get(trend, '')} |"
+         for name, value, change, trend in rows)
+    ))
+    cursor.execute("INSERT OR REPLACE INTO trajectory_report_cache VALUES (?, ?)",
+                   (today, markdown))
+    return markdown
 
 
 def generate_event_log_report(cursor, days: int = 30) -> str:
@@ -271,16 +334,12 @@ def generate_event_log_report(cursor, days: int = 30) -> str:
     if not events:
         return "No events logged yet."
 
-    lines = ["| Date | Event | Impact |",
-             "|------|-------|--------|"]
-
-    for event in events[:10]:  # Last 10 events
-        date = event[0]
-        title = f"**{event[1]}**: {event[2]}"[:50]
-        impact = event[3] or "—"
-        lines.append(f"| {date} | {title} | {impact} |")
-
-    return '\n'.join(lines)
+    return '\n'.join(chain(
+        ("| Date | Event | Impact |",
+         "|------|-------|--------|"),
+        (f"| {date} | {f'**{etype}**: {title}'[:50]} | {impact or '—'} |"
+         for date, etype, title, impact in events[:10])  # Last 10 events
+    ))
 
 
 def generate_researcher_log_report(cursor) -> str:
@@ -290,89 +349,76 @@ def generate_researcher_log_report(cursor) -> str:
     if not actions:
         return "No researcher actions logged yet."
 
-    lines = []
-    for action in actions[:5]:
-        date = action[0]
-        action_type = action[1]
-        desc = action[2][:60] if action[2] else ""
-        reaction = action[3] or 0
-        summary = action[4] or "no reaction yet"
-
-        lines.append(f"- **{date}** [{action_type}]: {desc}")
-        lines.append(f"  → Reaction: {reaction} ({summary})")
-
-    return '\n'.join(lines)
+    return '\n'.join(
+        f"- **{date}** [{action_type}]: {desc[:60] if desc else ''}\n"
+        f"  → Reaction: {reaction or 0} ({summary or 'no reaction yet'})"
+        for date, action_type, desc, reaction, summary in actions[:5]
+    )
+
+
+# All three detections in one INSERT-from-SELECT: one round-trip, and
+# matching rows go straight into event_log without surfacing in Python
+AUTO_EVENTS_SQL = """
+    INSERT INTO event_log (date, event_type, event_title, description,
+                           impact, actors_involved, metrics_affected)
+    SELECT date('now'), 'SECURITY',
+           'Injection wave detected (' || cnt || ' attempts)',
+           NULL, 'High', NULL, '["injection_count", "trust"]'
+    FROM (SELECT COUNT(*) as cnt FROM comments
+          WHERE is_prompt_injection = 1
+          AND scraped_at > datetime('now', '-24 hours'))
+    WHERE cnt > 50
+    UNION ALL
+    SELECT date('now'), 'CULTURAL',
+           'New viral meme: "' || substr(phrase, 1, 30) || '..."',
+           'Spread to ' || authors_count || ' authors in <24h',
+           'Medium', NULL, '["meme_spread"]'
+    FROM (SELECT phrase, authors_count FROM memes
+          WHERE first_seen_at > datetime('now', '-24 hours')
+          AND authors_count > 20
+          ORDER BY authors_count DESC
+          LIMIT 1)
+    UNION ALL
+    SELECT date('now'), 'CONFLICT',
+           'High-intensity conflict: ' || actor_a || ' vs ' || actor_b,
+           'Topic: ' || COALESCE(topic, ''),
+           'Medium', json_array(actor_a, actor_b), NULL
+    FROM (SELECT actor_a, actor_b, topic FROM conflicts
+          WHERE timestamp > datetime('now', '-24 hours')
+          AND intensity >= 8
+          LIMIT 1)
+"""
 
 
 def auto_detect_events(cursor):
     """Auto-detect significant events from data changes."""
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    # Check for injection spike
-    cursor.execute("""
-        SELECT COUNT(*) FROM comments
-        WHERE is_prompt_injection = 1
-        AND scraped_at > datetime('now', '-24 hours')
-    """)
-    recent_injections = cursor.fetchone()[0]
-
-    if recent_injections > 50:
-        log_event(cursor,
-                  event_type="SECURITY",
-                  title=f"Injection wave detected ({recent_injections} attempts)",
-                  impact="High",
-                  metrics=["injection_count", "trust"])
-
-    # Check for new viral meme
-    cursor.execute("""
-        SELECT phrase, authors_count FROM memes
-        WHERE first_seen_at > datetime('now', '-24 hours')
-        AND authors_count > 20
-        ORDER BY authors_count DESC
-        LIMIT 1
-    """)
-    viral = cursor.fetchone()
-    if viral:
-        log_event(cursor,
-                  event_type="CULTURAL",
-                  title=f"New viral meme: \"{viral[0][:30]}...\"",
-                  description=f"Spread to {viral[1]} authors in <24h",
-                  impact="Medium",
-                  metrics=["meme_spread"])
-
-    # Check for major conflict
-    cursor.execute("""
-        SELECT actor_a, actor_b, topic FROM conflicts
-        WHERE timestamp > datetime('now', '-24 hours')
-        AND intensity >= 8
-        LIMIT 1
-    """)
-    conflict = cursor.fetchone()
-    if conflict:
-        log_event(cursor,
-                  event_type="CONFLICT",
-                  title=f"High-intensity conflict: {conflict[0]} vs {conflict[1]}",
-                  description=f"Topic: {conflict[2]}",
-                  impact="Medium",
-                  actors=[conflict[0], conflict[1]])
+    cursor.execute(AUTO_EVENTS_SQL)
+    if cursor.rowcount:
+        logger.info(f"Auto-detected {cursor.rowcount} events")
 
 
 def run_daily_tracking():
     """Run all daily tracking tasks."""
-    conn = sqlite3.connect(DB_PATH)
+    # All SQL in this module is constant strings, so stdlib sqlite3 can
+    # reuse prepared statements across calls via its per-connection cache.
+    # isolation_level=None: transactions are managed explicitly below
+    conn = sqlite3.connect(DB_PATH, cached_statements=256, isolation_level=None)
+    _tune(conn)
     cursor = conn.cursor()
 
-    # Initialize tables
-    init_tables(cursor)
-    conn.commit()
-
-    # Save trajectory snapshot
-    metrics = save_trajectory_snapshot(cursor)
-    conn.commit()
-
-    # Auto-detect events
-    auto_detect_events(cursor)
-    conn.commit()
+    # One transaction for the whole write pass: a single fsync instead of
+    # three, and IMMEDIATE takes the write lock upfront so concurrent
+    # readers can't force a mid-run SQLITE_BUSY
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        init_tables(cursor)
+        save_trajectory_snapshot(cursor)
+        auto_detect_events(cursor)
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        conn.close()
+        raise
 
     # Print report
     print("\n" + "="*60)
@@ -388,6 +434,11 @@ def run_daily_tracking():
     print("\n## Researcher Log\n")
     print(generate_researcher_log_report(cursor))
 
+    # (report cache INSERTs autocommit under isolation_level=None)
+    conn.execute("PRAGMA optimize")  # recommended end-of-connection idiom
+    # Checkpoint here, in the batch window, rather than inline in some
+    # later commit - also truncates the -wal sidecar back to zero
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     conn.close()
 
 
@@ -5,9 +5,19 @@ import sys
 import json
 import time
 import re
-import html
+import functools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from pathlib import Path
+
+# Optional fast JSON parser (falls back to stdlib json via Response.json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 
@@ -18,6 +28,95 @@ if sys.platform == 'win32':
 PROJECT_ROOT = Path(__file__).parent.parent
 CONFIG_PATH = PROJECT_ROOT / "config" / "settings.json"
 
+# Sanitizer patterns fused into one alternation, compiled once (they run
+# per post x per field); the named group says which replacement applies
+_SANITIZE_RE = re.compile(
+    r'(?P<script>&lt;script.*?&gt;.*?&lt;/script&gt;)'
+    r'|(?P<b64>data:[^;]+;base64,[A-Za-z0-9+/=]+)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _sanitize_match(m):
+    return '[removed]' if m.lastgroup == 'script' else '[base64-removed]'
+
+
+# Same five characters html.escape(quote=True) handles, but one C-level
+# translate pass instead of five chained str.replace allocations
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+})
+
+
+class _LazySanitizedPost(dict):
+    """Post mapping that sanitizes 'title'/'content_sanitized' on first access.
+
+    Callers that never read those keys (id-based dedup, vote counting)
+    never pay the escape/regex cost; realized values are memoized into
+    the dict. Snapshot-style access (copy(), items(), dict(post) and
+    friends) realizes the lazy keys first, so dict-protocol consumers
+    like validate_post's post.copy() always see sanitized values.
+    """
+
+    def __init__(self, raw, api):
+        super().__init__(raw)
+        self._api = api
+        self._realized = set()
+
+    def _realize(self, key):
+        self._realized.add(key)
+        source = 'content' if key == 'content_sanitized' else key
+        value = self._api._sanitize_content(dict.__getitem__(self, source))
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _realize_all(self):
+        if 'title' not in self._realized and dict.__contains__(self, 'title'):
+            self._realize('title')
+        if ('content_sanitized' not in self._realized
+                and dict.__contains__(self, 'content')):
+            self._realize('content_sanitized')
+
+    def __getitem__(self, key):
+        if key in ('title', 'content_sanitized') and key not in self._realized:
+            return self._realize(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        # content_sanitized exists logically as soon as content does,
+        # even before it has been realized
+        if key == 'content_sanitized' and not dict.__contains__(self, key):
+            return dict.__contains__(self, 'content')
+        return dict.__contains__(self, key)
+
+    # Anything that hands out the backing dict wholesale must not leak
+    # unsanitized values; these are the paths dict-protocol consumers use
+    def copy(self):
+        self._realize_all()
+        return dict.copy(self)
+
+    def keys(self):
+        self._realize_all()
+        return dict.keys(self)
+
+    def values(self):
+        self._realize_all()
+        return dict.values(self)
+
+    def items(self):
+        self._realize_all()
+        return dict.items(self)
+
+    def __iter__(self):
+        self._realize_all()
+        return dict.__iter__(self)
+
 
 class MoltbookAPI:
     """Read-only Moltbook API client with rate limiting and content sanitization."""
@@ -27,8 +126,33 @@ class MoltbookAPI:
         self.base_url = self.config["moltbook"]["base_url"]
         self.rate_limit = self.config["moltbook"]["rate_limit_seconds"]
         self.timeout = self.config["moltbook"]["timeout_seconds"]
-        self.last_request_time = 0
-        self.request_log = []
+        self._sanitize_enabled = self.config["security"]["sanitize_content"]
+        self._max_len = self.config["security"]["max_content_length"]
+        self.last_request_time = 0  # audit log only; throttling uses the bucket
+        # Bounded: a long-lived scraping process would otherwise grow the
+        # log (one entry per API call) without limit. Entries are stored
+        # as tuples; get_request_log rebuilds dicts on the cold path
+        self.request_log = deque(
+            maxlen=self.config["security"].get("max_log_entries", 10000)
+        )
+
+        # Token bucket: bursts up to burst_capacity go back-to-back, only
+        # sustained traffic is throttled to one call per rate_limit seconds
+        self.burst_capacity = self.config["moltbook"].get("burst_capacity", 5)
+        self._tokens = float(self.burst_capacity)
+        self._last_refill = time.monotonic()
+        self._bucket_lock = threading.Lock()  # pages are fetched from worker threads
+
+        # Persistent session: keep-alive reuses the TCP+TLS connection
+        # across paginated calls instead of a fresh handshake per request
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": f"{self.config['moltbook']['agent_name']}/observatory",
+            "Accept": "application/json",
+        })
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=Retry(total=0)
+        ))
 
     def _load_config(self) -> dict:
         """Load configuration from settings.json."""
@@ -36,50 +160,78 @@ class MoltbookAPI:
             return json.load(f)
 
     def _rate_limit_wait(self):
-        """Wait to respect rate limit."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            wait_time = self.rate_limit - elapsed
-            time.sleep(wait_time)
+        """Take a token from the rate-limit bucket, sleeping if it's empty.
+
+        monotonic() so wall-clock jumps can't corrupt the accounting.
+        """
+        if self.rate_limit <= 0:
+            self.last_request_time = time.time()
+            return
+
+        refill_rate = 1.0 / self.rate_limit  # tokens per second
+
+        # Reserve a token under the lock, sleep outside it: each caller
+        # (thread) gets its own admission slot and can't double-spend
+        with self._bucket_lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst_capacity),
+                               self._tokens + (now - self._last_refill) * refill_rate)
+            self._last_refill = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / refill_rate
+
+        if wait:
+            time.sleep(wait)
+
         self.last_request_time = time.time()
 
     def _log_request(self, endpoint: str, method: str, params: dict,
                      status_code: int, response_size: int, duration_ms: int):
         """Log request for security auditing."""
-        self.request_log.append({
-            "timestamp": datetime.now().isoformat(),
-            "endpoint": endpoint,
-            "method": method,
-            "params": params,
-            "status_code": status_code,
-            "response_size": response_size,
-            "duration_ms": duration_ms
-        })
-
-    def _sanitize_content(self, text: Optional[str]) -> Optional[str]:
-        """Sanitize content to prevent injection attacks."""
-        if not text:
-            return text
-
-        if not self.config["security"]["sanitize_content"]:
-            return text
-
+        self.request_log.append((
+            datetime.now().isoformat(),
+            endpoint,
+            method,
+            params,
+            status_code,
+            response_size,
+            duration_ms
+        ))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _sanitize_cached(text: str, max_len: int) -> str:
+        """Truncate + escape + strip pipeline, memoized by content.
+
+        Overlapping pagination pages and repeated feed scans hand the
+        sanitizer the same bodies; identical text costs a cache hit.
+        """
         # Truncate if too long
-        max_len = self.config["security"]["max_content_length"]
         if len(text) > max_len:
             text = text[:max_len] + "... [truncated]"
 
         # HTML escape
-        text = html.escape(text)
+        text = text.translate(_HTML_ESCAPE_TABLE)
 
-        # Remove potential script tags (already escaped, but extra safety)
-        text = re.sub(r'&lt;script.*?&gt;.*?&lt;/script&gt;', '[removed]', text, flags=re.IGNORECASE | re.DOTALL)
-
-        # Remove base64 encoded content (potential payloads)
-        text = re.sub(r'data:[^;]+;base64,[A-Za-z0-9+/=]+', '[base64-removed]', text)
+        # Strip script tags (already escaped, but extra safety) and base64
+        # payloads in one pass - and skip the regex engine entirely when
+        # neither token is present, which is the common case
+        lowered = text.lower()
+        if '&lt;script' in lowered or 'data:' in lowered:
+            text = _SANITIZE_RE.sub(_sanitize_match, text)
 
         return text
 
+    def _sanitize_content(self, text: Optional[str]) -> Optional[str]:
+        """Sanitize content to prevent injection attacks."""
+        if not text:
+            return text
+
+        if not self._sanitize_enabled:
+            return text
+
+        return self._sanitize_cached(text, self._max_len)
+
     def _sanitize_post(self, post: dict) -> dict:
         """Sanitize a post object."""
         sanitized = post.copy()
@@ -100,7 +252,7 @@ class MoltbookAPI:
         start_time = time.time()
 
         try:
-            resp = requests.get(url, params=params, timeout=self.timeout)
+            resp = self.session.get(url, params=params, timeout=self.timeout)
             duration_ms = int((time.time() - start_time) * 1000)
 
             self._log_request(
@@ -113,6 +265,9 @@ class MoltbookAPI:
             )
 
             resp.raise_for_status()
+            if orjson is not None:
+                # parses straight from bytes, skipping .json()'s charset sniff
+                return orjson.loads(resp.content)
             return resp.json()
 
         except requests.exceptions.RequestException as e:
@@ -138,33 +293,62 @@ class MoltbookAPI:
             return None
 
         posts = data.get("posts", data) if isinstance(data, dict) else data
-        return [self._sanitize_post(p) for p in posts]
+        # Lazy wrappers: sanitization happens on first access per field,
+        # so a 200-post fetch does zero regex work until fields are read
+        return [_LazySanitizedPost(p, self) for p in posts]
 
     def get_posts_paginated(self, sort: str = "hot", total_limit: int = 200,
                             per_page: int = 50, submolt: Optional[str] = None) -> List[dict]:
-        """Get multiple pages of posts."""
+        """Get multiple pages of posts.
+
+        Pages go out in waves of two, each wave gated on the previous
+        one returning new posts, and are merged in page order so dedup
+        and the returned ordering match the old sequential loop. An API
+        that doesn't paginate costs the same two requests as that loop
+        instead of speculatively burning max_pages token-bucket slots;
+        futures left pending when a wave stops early are cancelled.
+        """
         all_posts = []
         seen_ids = set()
-        page = 1
         max_pages = (total_limit // per_page) + 1
-
-        while len(all_posts) < total_limit and page <= max_pages:
-            posts = self.get_posts(sort=sort, limit=per_page, submolt=submolt, page=page)
-            if not posts:
-                break
-
-            # Deduplicate
-            new_posts = [p for p in posts if p.get("id") not in seen_ids]
-            if not new_posts:
-                # No new posts, API might not support pagination
-                break
-
-            for p in new_posts:
-                seen_ids.add(p.get("id"))
-            all_posts.extend(new_posts)
-
-            print(f"    Page {page}: got {len(new_posts)} new posts (total: {len(all_posts)})")
-            page += 1
+        wave_size = 2
+        stop = False
+
+        with ThreadPoolExecutor(max_workers=wave_size) as executor:
+            page = 1
+            while page <= max_pages and not stop and len(all_posts) < total_limit:
+                wave = range(page, min(page + wave_size, max_pages + 1))
+                futures = [
+                    executor.submit(self.get_posts, sort=sort, limit=per_page,
+                                    submolt=submolt, page=p)
+                    for p in wave
+                ]
+
+                for p, future in zip(wave, futures):
+                    if stop or len(all_posts) >= total_limit:
+                        stop = True
+                        future.cancel()
+                        continue
+
+                    posts = future.result()
+                    if not posts:
+                        stop = True
+                        continue
+
+                    # Deduplicate
+                    new_posts = [x for x in posts if x.get("id") not in seen_ids]
+                    if not new_posts:
+                        # No new posts, API might not support pagination
+                        stop = True
+                        continue
+
+                    for x in new_posts:
+                        seen_ids.add(x.get("id"))
+                    all_posts.extend(new_posts)
+
+                    print(f"    Page {p}: got {len(new_posts)} new posts (total: {len(all_posts)})")
+
+                page = wave.stop
 
         return all_posts[:total_limit]
 
@@ -190,7 +374,9 @@ class MoltbookAPI:
 
     def get_request_log(self) -> List[dict]:
         """Get the request log for auditing."""
-        return self.request_log
+        keys = ("timestamp", "endpoint", "method", "params",
+                "status_code", "response_size", "duration_ms")
+        return [dict(zip(keys, entry)) for entry in self.request_log]
 
     def calculate_controversy(self, upvotes: int, downvotes: int,
                               comments: int) -> float:
@@ -2,44 +2,69 @@
 """OpenRouter API client for Moltbook Observatory - uses Kimi K2.5."""
 
 import os
+import re
 import json
+import time
+import random
+import sqlite3
+import hashlib
+import functools
 import requests
 from pathlib import Path
 
-# Load API key from various sources
-OPENROUTER_API_KEY = None
-
-# Source 1: Environment variable
-OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
-
-# Source 2: .openclaw/.env file
-if not OPENROUTER_API_KEY:
-    OPENCLAW_ENV = Path.home() / ".openclaw" / ".env"
-    if OPENCLAW_ENV.exists():
-        with open(OPENCLAW_ENV, "r") as f:
-            for line in f:
-                if line.startswith("OPENROUTER_API_KEY="):
-                    OPENROUTER_API_KEY = line.strip().split("=", 1)[1]
-                    break
-
-# Source 3: OpenClaw auth-profiles.json (where openclaw configure stores keys)
-if not OPENROUTER_API_KEY:
-    AUTH_PROFILES = Path.home() / ".openclaw" / "agents" / "main" / "agent" / "auth-profiles.json"
-    if AUTH_PROFILES.exists():
+from config import DB_PATH
+
+# Optional fast JSON serializer (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ENV_KEY_RE = re.compile(r'^OPENROUTER_API_KEY=(.+)$', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_api_key():
+    """Find the OpenRouter API key from various sources.
+
+    Runs at first call_kimi use, not at import time, so scripts that
+    import this module but never call the API pay zero disk I/O here.
+    """
+    # Source 1: Environment variable
+    key = os.environ.get("OPENROUTER_API_KEY")
+    if key:
+        return key
+
+    # Source 2: .openclaw/.env file
+    openclaw_env = Path.home() / ".openclaw" / ".env"
+    if openclaw_env.exists():
+        m = _ENV_KEY_RE.search(openclaw_env.read_text())
+        if m:
+            return m.group(1).strip()
+
+    # Source 3: OpenClaw auth-profiles.json (where openclaw configure stores keys)
+    auth_profiles = Path.home() / ".openclaw" / "agents" / "main" / "agent" / "auth-profiles.json"
+    if auth_profiles.exists():
         try:
-            import json
-            with open(AUTH_PROFILES, "r") as f:
-                profiles = json.load(f)
-            # Look for openrouter profile
-            for profile_name, profile_data in profiles.get("profiles", {}).items():
-                if profile_data.get("provider") == "openrouter" and profile_data.get("key"):
-                    OPENROUTER_API_KEY = profile_data["key"]
-                    break
+            raw = auth_profiles.read_text()
+            # Cheap substring pre-filter before paying for the JSON parse
+            if '"provider": "openrouter"' in raw or '"provider":"openrouter"' in raw:
+                profiles = json.loads(raw)
+                # Look for openrouter profile
+                for profile_name, profile_data in profiles.get("profiles", {}).items():
+                    if profile_data.get("provider") == "openrouter" and profile_data.get("key"):
+                        return profile_data["key"]
         except (json.JSONDecodeError, KeyError):
             pass
 
+    return None
+
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Single host, so one shared session keeps the TLS connection alive
+# across calls and retries
+_session = requests.Session()
+
 # Available models (K2.5 is default - better reasoning, 262K context)
 MODELS = {
     "k2.5": "moonshotai/kimi-k2.5",        # Best quality, 262K context
@@ -49,6 +74,66 @@ MODELS = {
 }
 DEFAULT_MODEL = MODELS["k2.5"]
 
+# Identical prompts within a day return the cached response instead of
+# paying the API round-trip (and cost) again
+_CACHE_TTL_SECONDS = 24 * 3600
+
+
+def _cache_key(prompt: str, system_prompt: str, model: str, max_tokens: int) -> str:
+    raw = "\0".join([prompt, system_prompt or "", model, str(max_tokens)])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str):
+    """Return the cached response dict, or None if absent/expired."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS kimi_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT,
+                    ts REAL
+                )
+            """)
+            row = conn.execute(
+                "SELECT response, ts FROM kimi_cache WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row and time.time() - row[1] < _CACHE_TTL_SECONDS:
+            return json.loads(row[0])
+    except (sqlite3.Error, json.JSONDecodeError):
+        pass
+    return None
+
+
+def _cache_put(key: str, response: dict):
+    """Store a successful response; expired entries are swept on write."""
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS kimi_cache (
+                        key TEXT PRIMARY KEY,
+                        response TEXT,
+                        ts REAL
+                    )
+                """)
+                conn.execute(
+                    "DELETE FROM kimi_cache WHERE ts < ?",
+                    (time.time() - _CACHE_TTL_SECONDS,)
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO kimi_cache (key, response, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(response), time.time())
+                )
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
 
 def call_kimi(prompt: str, system_prompt: str = None, model: str = DEFAULT_MODEL,
                max_tokens: int = 4000, max_retries: int = 3) -> dict:
@@ -61,18 +146,22 @@ def call_kimi(prompt: str, system_prompt: str = None, model: str = DEFAULT_MODEL
     Args:
         max_retries: Number of retries for transient errors (default: 3)
     """
-    import time
-
-    if not OPENROUTER_API_KEY:
+    api_key = _discover_api_key()
+    if not api_key:
         return {"error": "No OPENROUTER_API_KEY found"}
 
+    cache_key = _cache_key(prompt, system_prompt, model, max_tokens)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     messages = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
     messages.append({"role": "user", "content": prompt})
 
     headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
         "HTTP-Referer": "https://noosphereproject.com",
         "X-Title": "Noosphere Project"
@@ -86,12 +175,18 @@ def call_kimi(prompt: str, system_prompt: str = None, model: str = DEFAULT_MODEL
     }
 
     last_error = None
-    response = None  # Initialize to prevent NameError in exception handler
     for attempt in range(max_retries):
+        retry_after = None
         try:
-            response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=120)
+            if orjson is not None:
+                # Content-Type is already set in headers above
+                response = _session.post(OPENROUTER_URL, headers=headers,
+                                         data=orjson.dumps(payload), timeout=120)
+            else:
+                response = _session.post(OPENROUTER_URL, headers=headers,
+                                         json=payload, timeout=120)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson is not None else response.json()
 
             message = data["choices"][0]["message"]
             content = message.get("content", "")
@@ -99,28 +194,39 @@ def call_kimi(prompt: str, system_prompt: str = None, model: str = DEFAULT_MODEL
             # K2.5 may have reasoning in separate field
             reasoning = message.get("reasoning", "")
 
-            return {
+            result = {
                 "content": content,
                 "reasoning": reasoning,  # K2.5 thinking process
                 "model": data.get("model", model),
                 "usage": data.get("usage", {}),
                 "cost": data.get("usage", {}).get("cost", 0)
             }
+            _cache_put(cache_key, result)
+            return result
         except requests.Timeout:
             last_error = "Request timeout (120s)"
             # Retry on timeout
         except requests.RequestException as e:
             last_error = f"Network error: {e}"
-            # Retry on network errors
-            if response is not None and response.status_code in (400, 401, 403, 404):
-                # Don't retry on client errors
-                return {"error": last_error}
+            # Retry on network errors; e.response (not a local) is the
+            # reliable handle - it's None on connection-level failures
+            resp = e.response
+            if resp is not None:
+                if resp.status_code in (400, 401, 403, 404):
+                    # Don't retry on client errors
+                    return {"error": last_error}
+                # 429/503: the provider may say how long to back off
+                retry_after = resp.headers.get("Retry-After")
         except Exception as e:
             return {"error": str(e)}
 
-        # Exponential backoff before retry
+        # Honor Retry-After when numeric, else exponential backoff with
+        # jitter so coordinated retries don't stampede the provider
         if attempt < max_retries - 1:
-            wait_time = (2 ** attempt) + 1  # 2, 3, 5 seconds
+            try:
+                wait_time = float(retry_after)
+            except (TypeError, ValueError):
+                wait_time = (2 ** attempt) + random.uniform(0, 1)
             time.sleep(wait_time)
 
     return {"error": f"{last_error} (after {max_retries} retries)"}
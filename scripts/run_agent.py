@@ -7,10 +7,17 @@ Usage: python run_agent.py <agent_name> [--test]
 import os
 import sys
 import json
+import functools
 import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+# Optional fast JSON serializer (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Fix Windows encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -23,19 +30,67 @@ DB_PATH = DATA_DIR / "observatory.db"
 LOGS_DIR = PROJECT_DIR / "logs"
 
 
+# Memoized file loads, keyed on (path, mtime): repeated invocations in
+# one process (e.g. a parent script running all four agents) skip the
+# re-read and re-parse, while an edited file busts the cache via mtime
+@functools.lru_cache(maxsize=8)
+def _read_text_cached(path_str: str, mtime: float) -> str:
+    return Path(path_str).read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path_str: str, mtime: float) -> dict:
+    with open(path_str, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def load_agent_prompt(agent_name: str) -> str:
     """Load AGENT.md for the specified agent."""
     agent_file = AGENTS_DIR / agent_name / "AGENT.md"
     if not agent_file.exists():
         raise FileNotFoundError(f"Agent {agent_name} not found at {agent_file}")
-    return agent_file.read_text(encoding="utf-8")
+    return _read_text_cached(str(agent_file), agent_file.stat().st_mtime)
 
 
 def load_settings() -> dict:
     """Load global settings."""
     settings_file = PROJECT_DIR / "config" / "settings.json"
-    with open(settings_file, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load_json_cached(str(settings_file), settings_file.stat().st_mtime)
+
+
+# build_prompt caps the serialized context at 10k chars, so there is no
+# point materializing multi-KB post bodies or row sets far past that
+# just to slice them away after a full json.dumps
+_MAX_FIELD_CHARS = 500
+_MAX_CONTEXT_CHARS = 9500
+
+
+def _fetch_dicts(cursor, sql: str, params=()) -> list:
+    """Run a query and return all rows as plain dicts.
+
+    Relies on conn.row_factory = sqlite3.Row (set in main) so column
+    names come for free instead of walking cursor.description per query.
+    Long string fields are clipped to _MAX_FIELD_CHARS: these rows only
+    ever feed the size-capped prompt context.
+    """
+    cursor.execute(sql, params)
+    rows = [dict(row) for row in cursor.fetchall()]
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, str) and len(value) > _MAX_FIELD_CHARS:
+                row[key] = value[:_MAX_FIELD_CHARS] + "... [truncated]"
+    return rows
+
+
+def _cap_context_rows(rows: list, budget: int) -> list:
+    """Keep leading rows until their serialized size exceeds budget."""
+    kept, used = [], 0
+    for row in rows:
+        used += len(json.dumps(row, default=str))
+        if used > budget and kept:
+            break
+        kept.append(row)
+    return kept
 
 
 def get_recent_data(agent_name: str, conn: sqlite3.Connection) -> dict:
@@ -51,91 +106,76 @@ def get_recent_data(agent_name: str, conn: sqlite3.Connection) -> dict:
         return {"feed_data": []}
 
     elif agent_name == "analyst":
-        # Analyst gets recent scans
-        cursor.execute("""
-            SELECT * FROM scans
-            ORDER BY timestamp DESC LIMIT 5
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        scans = [dict(zip(columns, row)) for row in rows]
-
-        # Also get recent posts
-        cursor.execute("""
-            SELECT * FROM posts
-            ORDER BY scraped_at DESC LIMIT 50
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        posts = [dict(zip(columns, row)) for row in rows]
-
-        return {"recent_scans": scans, "recent_posts": posts}
+        # Analyst gets recent scans plus recent posts
+        return {
+            "recent_scans": _fetch_dicts(cursor, """
+                SELECT * FROM scans
+                ORDER BY timestamp DESC LIMIT 5
+            """),
+            "recent_posts": _fetch_dicts(cursor, """
+                SELECT * FROM posts
+                ORDER BY scraped_at DESC LIMIT 50
+            """),
+        }
 
     elif agent_name == "interpreter":
         # Interpreter gets recent patterns
-        cursor.execute("""
-            SELECT * FROM patterns
-            ORDER BY timestamp DESC LIMIT 10
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        patterns = [dict(zip(columns, row)) for row in rows]
-
-        cursor.execute("""
-            SELECT * FROM scans
-            ORDER BY timestamp DESC LIMIT 3
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        scans = [dict(zip(columns, row)) for row in rows]
-
-        return {"recent_patterns": patterns, "recent_scans": scans}
+        return {
+            "recent_patterns": _fetch_dicts(cursor, """
+                SELECT * FROM patterns
+                ORDER BY timestamp DESC LIMIT 10
+            """),
+            "recent_scans": _fetch_dicts(cursor, """
+                SELECT * FROM scans
+                ORDER BY timestamp DESC LIMIT 3
+            """),
+        }
 
     elif agent_name == "editor":
-        # Editor gets everything from last 24h
-        cursor.execute("""
-            SELECT * FROM scans
-            WHERE timestamp > datetime('now', '-24 hours')
-            ORDER BY timestamp DESC
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        scans = [dict(zip(columns, row)) for row in rows]
-
-        cursor.execute("""
-            SELECT * FROM patterns
-            WHERE timestamp > datetime('now', '-24 hours')
-            ORDER BY timestamp DESC
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        patterns = [dict(zip(columns, row)) for row in rows]
-
-        cursor.execute("""
-            SELECT * FROM interpretations
-            WHERE timestamp > datetime('now', '-24 hours')
-            ORDER BY timestamp DESC
-        """)
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        interpretations = [dict(zip(columns, row)) for row in rows]
-
+        # Editor gets everything from last 24h; the unbounded queries can
+        # return hundreds of rows, so each list is capped to a third of
+        # the context budget (newest rows first, matching the ORDER BY)
+        budget = _MAX_CONTEXT_CHARS // 3
         return {
-            "scans": scans,
-            "patterns": patterns,
-            "interpretations": interpretations
+            "scans": _cap_context_rows(_fetch_dicts(cursor, """
+                SELECT * FROM scans
+                WHERE timestamp > datetime('now', '-24 hours')
+                ORDER BY timestamp DESC
+            """), budget),
+            "patterns": _cap_context_rows(_fetch_dicts(cursor, """
+                SELECT * FROM patterns
+                WHERE timestamp > datetime('now', '-24 hours')
+                ORDER BY timestamp DESC
+            """), budget),
+            "interpretations": _cap_context_rows(_fetch_dicts(cursor, """
+                SELECT * FROM interpretations
+                WHERE timestamp > datetime('now', '-24 hours')
+                ORDER BY timestamp DESC
+            """), budget),
         }
 
     return {}
 
 
+@functools.lru_cache(maxsize=16)
+def _join_focus(values: tuple) -> str:
+    """Cache the comma-joined focus lists; settings rarely change."""
+    return ', '.join(values)
+
+
 def build_prompt(agent_name: str, agent_md: str, context_data: dict, settings: dict) -> str:
     """Build the full prompt for the agent."""
 
     timestamp = datetime.now().isoformat()
 
-    # Truncate large data for display
-    context_str = json.dumps(context_data, indent=2, default=str, ensure_ascii=False)
+    # Truncate large data for display (orjson never escapes non-ASCII,
+    # matching ensure_ascii=False)
+    if orjson is not None:
+        context_str = orjson.dumps(
+            context_data, option=orjson.OPT_INDENT_2, default=str
+        ).decode("utf-8")
+    else:
+        context_str = json.dumps(context_data, indent=2, default=str, ensure_ascii=False)
     if len(context_str) > 10000:
         context_str = context_str[:10000] + "\n... [truncated]"
 
@@ -148,9 +188,9 @@ def build_prompt(agent_name: str, agent_md: str, context_data: dict, settings: d
 {agent_md}
 
 ## Current Focus Areas
-Submolts: {', '.join(settings['focus']['submolts'])}
-Key Actors: {', '.join(settings['focus']['actors'])}
-Keywords: {', '.join(settings['focus']['keywords'])}
+Submolts: {_join_focus(tuple(settings['focus']['submolts']))}
+Key Actors: {_join_focus(tuple(settings['focus']['actors']))}
+Keywords: {_join_focus(tuple(settings['focus']['keywords']))}
 
 ## Input Data
 ```json
@@ -177,103 +217,144 @@ def save_result(agent_name: str, result: dict, conn: sqlite3.Connection):
     timestamp = datetime.now().isoformat()
 
     try:
-        if agent_name == "scanner":
-            scan_id = f"scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            cursor.execute("""
-                INSERT INTO scans (id, timestamp, period, top_posts, top_authors, active_submolts, alerts, stats)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                scan_id,
+        # with conn: one transaction (and one fsync) per agent run,
+        # rolled back as a unit on error
+        with conn:
+            _save_result_rows(agent_name, result, cursor, timestamp)
+    except Exception as e:
+        print(f"[ERROR] Saving result: {e}")
+
+
+def _save_result_rows(agent_name: str, result: dict, cursor, timestamp: str):
+    """Write one agent's result rows inside the caller's transaction."""
+    if agent_name == "scanner":
+        scan_id = f"scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        cursor.execute("""
+            INSERT INTO scans (id, timestamp, period, top_posts, top_authors, active_submolts, alerts, stats)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            scan_id,
+            timestamp,
+            result.get("period", "1h"),
+            json.dumps(result.get("top_posts", [])),
+            json.dumps(result.get("top_authors", [])),
+            json.dumps(result.get("active_submolts", [])),
+            json.dumps(result.get("alerts", [])),
+            json.dumps(result.get("stats", {}))
+        ))
+        # Normalized copies of the high-churn arrays (JSON blobs above
+        # stay for existing readers); downstream queries can JOIN these
+        # instead of re-parsing blob columns
+        cursor.executemany("""
+            INSERT INTO scan_posts (scan_id, rank, post_id, score)
+            VALUES (?, ?, ?, ?)
+        """, (
+            (scan_id, rank, post.get("id"), post.get("score"))
+            for rank, post in enumerate(result.get("top_posts", []), 1)
+            if isinstance(post, dict)
+        ))
+        cursor.executemany("""
+            INSERT INTO scan_alerts (scan_id, alert_text)
+            VALUES (?, ?)
+        """, (
+            (scan_id, alert if isinstance(alert, str) else json.dumps(alert))
+            for alert in result.get("alerts", [])
+        ))
+        print(f"[OK] Saved scan: {scan_id}")
+
+    elif agent_name == "analyst":
+        analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        patterns = result.get("patterns", [])
+        # executemany: statement compiled once, rows bound in a C loop
+        cursor.executemany("""
+            INSERT INTO patterns (analysis_id, timestamp, pattern_type, name, description, direction, change_percent, confidence, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (
+                analysis_id,
+                timestamp,
+                pattern.get("type", "unknown"),
+                pattern.get("name", ""),
+                pattern.get("description", ""),
+                pattern.get("direction", ""),
+                pattern.get("change", 0),
+                pattern.get("confidence", 0),
+                json.dumps(pattern.get("evidence", []))
+            )
+            for pattern in patterns
+        ))
+        # Evidence items row-per-item, keyed by (analysis_id, name) since
+        # the bulk insert above doesn't hand back per-pattern rowids
+        cursor.executemany("""
+            INSERT INTO pattern_evidence (analysis_id, pattern_name, evidence_text)
+            VALUES (?, ?, ?)
+        """, (
+            (analysis_id, pattern.get("name", ""),
+             ev if isinstance(ev, str) else json.dumps(ev))
+            for pattern in patterns
+            for ev in pattern.get("evidence", [])
+        ))
+        print(f"[OK] Saved {len(patterns)} patterns from {analysis_id}")
+
+    elif agent_name == "interpreter":
+        interp_id = f"interp_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        questions_json = json.dumps(result.get("questions", []))
+
+        # Both categories share the statement; category and per-category
+        # risk/questions defaults are pre-baked per row
+        rows = [
+            (
+                interp_id,
                 timestamp,
-                result.get("period", "1h"),
-                json.dumps(result.get("top_posts", [])),
-                json.dumps(result.get("top_authors", [])),
-                json.dumps(result.get("active_submolts", [])),
-                json.dumps(result.get("alerts", [])),
-                json.dumps(result.get("stats", {}))
-            ))
-            print(f"[OK] Saved scan: {scan_id}")
-
-        elif agent_name == "analyst":
-            analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            for pattern in result.get("patterns", []):
-                cursor.execute("""
-                    INSERT INTO patterns (analysis_id, timestamp, pattern_type, name, description, direction, change_percent, confidence, evidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    analysis_id,
-                    timestamp,
-                    pattern.get("type", "unknown"),
-                    pattern.get("name", ""),
-                    pattern.get("description", ""),
-                    pattern.get("direction", ""),
-                    pattern.get("change", 0),
-                    pattern.get("confidence", 0),
-                    json.dumps(pattern.get("evidence", []))
-                ))
-            print(f"[OK] Saved {len(result.get('patterns', []))} patterns from {analysis_id}")
-
-        elif agent_name == "interpreter":
-            interp_id = f"interp_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-            for item in result.get("fascinating", []):
-                cursor.execute("""
-                    INSERT INTO interpretations (interpretation_id, timestamp, category, observation, meaning, implications, risk_level, recommendations, questions)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    interp_id,
-                    timestamp,
-                    "fascinating",
-                    item.get("observation", ""),
-                    item.get("meaning", ""),
-                    item.get("implications", ""),
-                    "low",
-                    json.dumps(item.get("recommendations", [])),
-                    json.dumps([])
-                ))
-
-            for item in result.get("concerning", []):
-                cursor.execute("""
-                    INSERT INTO interpretations (interpretation_id, timestamp, category, observation, meaning, implications, risk_level, recommendations, questions)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    interp_id,
-                    timestamp,
-                    "concerning",
-                    item.get("observation", ""),
-                    item.get("meaning", ""),
-                    item.get("implications", ""),
-                    item.get("risk_level", "medium"),
-                    json.dumps(item.get("recommendations", [])),
-                    json.dumps(result.get("questions", []))
-                ))
-
-            print(f"[OK] Saved interpretations: {interp_id}")
-
-        elif agent_name == "editor":
-            brief_id = f"brief_{datetime.now().strftime('%Y%m%d')}"
-            cursor.execute("""
-                INSERT OR REPLACE INTO briefs (id, date, timestamp, headline, alerts, top_stories, trends_summary, actors_to_watch, recommendations, meta)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                brief_id,
-                datetime.now().date().isoformat(),
+                "fascinating",
+                item.get("observation", ""),
+                item.get("meaning", ""),
+                item.get("implications", ""),
+                "low",
+                json.dumps(item.get("recommendations", [])),
+                json.dumps([])
+            )
+            for item in result.get("fascinating", [])
+        ]
+        rows.extend(
+            (
+                interp_id,
                 timestamp,
-                result.get("headline", ""),
-                json.dumps(result.get("alerts", [])),
-                json.dumps(result.get("top_stories", [])),
-                json.dumps(result.get("trends_summary", {})),
-                json.dumps(result.get("actors_to_watch", [])),
-                json.dumps(result.get("recommendations", [])),
-                json.dumps(result.get("meta", {}))
-            ))
-            print(f"[OK] Saved daily brief: {brief_id}")
-
-        conn.commit()
+                "concerning",
+                item.get("observation", ""),
+                item.get("meaning", ""),
+                item.get("implications", ""),
+                item.get("risk_level", "medium"),
+                json.dumps(item.get("recommendations", [])),
+                questions_json
+            )
+            for item in result.get("concerning", [])
+        )
+        cursor.executemany("""
+            INSERT INTO interpretations (interpretation_id, timestamp, category, observation, meaning, implications, risk_level, recommendations, questions)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+        print(f"[OK] Saved interpretations: {interp_id}")
 
-    except Exception as e:
-        print(f"[ERROR] Saving result: {e}")
-        conn.rollback()
+    elif agent_name == "editor":
+        brief_id = f"brief_{datetime.now().strftime('%Y%m%d')}"
+        cursor.execute("""
+            INSERT OR REPLACE INTO briefs (id, date, timestamp, headline, alerts, top_stories, trends_summary, actors_to_watch, recommendations, meta)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            brief_id,
+            datetime.now().date().isoformat(),
+            timestamp,
+            result.get("headline", ""),
+            json.dumps(result.get("alerts", [])),
+            json.dumps(result.get("top_stories", [])),
+            json.dumps(result.get("trends_summary", {})),
+            json.dumps(result.get("actors_to_watch", [])),
+            json.dumps(result.get("recommendations", [])),
+            json.dumps(result.get("meta", {}))
+        ))
+        print(f"[OK] Saved daily brief: {brief_id}")
 
 
 def run_with_claude(prompt: str, agent_name: str) -> dict:
@@ -325,6 +406,14 @@ def main():
 
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # WAL survives in the file; the rest tunes this connection. With
+    # synchronous=NORMAL the single commit per agent run (save_result's
+    # with-block) no longer pays a full fsync
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-64000")
 
     # Get context data
     context_data = get_recent_data(agent_name, conn)
@@ -9,8 +9,14 @@ Usage:
     python run_all.py --continue   # Continue even if steps fail
 """
 
+import io
+import os
 import sys
+import json
+import hashlib
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -21,7 +27,31 @@ if sys.platform == 'win32':
 SCRIPT_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
-from config import DB_PATH, setup_logging
+from config import DB_PATH, open_db, setup_logging
+
+# Pipeline step imports resolved once at module load (any import-time
+# work in the step modules happens before timing starts); a missing
+# module degrades just its own step instead of killing the pipeline
+try:
+    from run_scanner import run_scanner
+except ImportError:
+    run_scanner = None
+try:
+    from run_analyst_now import analyze_data
+except ImportError:
+    analyze_data = None
+try:
+    from diff_engine import get_diff_summary, compare_scans, print_diff_report
+except ImportError:
+    compare_scans = None
+try:
+    from alerts import detect_alerts, prioritize_alerts, print_alerts, get_alerts_summary
+except ImportError:
+    detect_alerts = None
+try:
+    from openrouter_client import call_kimi
+except ImportError:
+    call_kimi = None
 
 logger = setup_logging("run_all")
 
@@ -31,8 +61,82 @@ class PipelineError(Exception):
     pass
 
 
+# Checkpoint file next to the database; lets --resume skip steps that
+# already completed for the same data instead of redoing them
+STATE_PATH = DB_PATH.parent / "pipeline_state.json"
+
+# Pipeline state machine, in completion order
+_STEPS = ["INITIALIZED", "SCANNED", "ANALYZED", "DIFFED", "ALERTED", "COMPLETED"]
+
+
+def _scan_fingerprint() -> str:
+    """Hash of the posts table state, same shape as the analyst memo key."""
+    try:
+        conn = open_db()
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*), COALESCE(MAX(rowid), 0),
+                       COALESCE(MAX(scraped_at), ''), COALESCE(MAX(updated_at), '')
+                FROM posts
+            """).fetchone()
+        finally:
+            conn.close()
+    except Exception:
+        return ""
+    return hashlib.sha1(repr(tuple(row)).encode()).hexdigest()
+
+
+def _save_checkpoint(step: str, state: dict):
+    """Atomically persist pipeline progress (write temp file, then rename)."""
+    state = dict(state, step=step, updated=datetime.now().isoformat())
+    tmp_path = STATE_PATH.with_suffix(".json.tmp")
+    try:
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, STATE_PATH)
+    except OSError as e:
+        logger.warning(f"Cannot save checkpoint: {e}")
+
+
+def _load_checkpoint() -> dict:
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _step_done(state: dict, step: str) -> bool:
+    """True if `step` already completed according to the checkpoint."""
+    try:
+        return _STEPS.index(state.get("step", "")) >= _STEPS.index(step)
+    except ValueError:
+        return False
+
+
+class _ThreadStdoutRouter:
+    """Routes print() output to a per-thread buffer.
+
+    Installed while the diff and alerts steps run concurrently so their
+    output is captured separately and can be flushed in step order
+    instead of interleaving; threads without a registered buffer (the
+    main thread) keep writing to the real stdout.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def register(self, buf):
+        self._local.buf = buf
+
+    def write(self, s):
+        return getattr(self._local, 'buf', self._fallback).write(s)
+
+    def flush(self):
+        getattr(self._local, 'buf', self._fallback).flush()
+
+
 def run_pipeline(use_ai: bool = True, scan_only: bool = False, scan_limit: int = 50,
-                 continue_on_error: bool = False) -> bool:
+                 continue_on_error: bool = False, resume: bool = False) -> bool:
     """Run the complete Observatory pipeline.
 
     Args:
@@ -40,12 +144,24 @@ def run_pipeline(use_ai: bool = True, scan_only: bool = False, scan_limit: int =
         scan_only: Only fetch data, skip analysis
         scan_limit: Number of posts to fetch
         continue_on_error: Continue pipeline even if critical steps fail
+        resume: Skip steps already completed per pipeline_state.json
 
     Returns:
         True if pipeline completed successfully, False otherwise
     """
     errors = []
 
+    # A checkpoint is only trusted while the posts table still matches
+    # the hash recorded with it; new data invalidates it
+    state = {}
+    if resume:
+        state = _load_checkpoint()
+        if state and state.get("scan_hash") != _scan_fingerprint():
+            print("\n[RESUME] Data changed since checkpoint - starting fresh")
+            state = {}
+        elif state:
+            print(f"\n[RESUME] Checkpoint found: {state.get('step')}")
+
     print("\n" + "=" * 60)
     print("  MOLTBOOK OBSERVATORY - Full Pipeline")
     print("=" * 60)
@@ -56,17 +172,23 @@ def run_pipeline(use_ai: bool = True, scan_only: bool = False, scan_limit: int =
     print("\n>> STEP 1: Fetching fresh data...")
     print("-" * 40)
 
-    try:
-        from run_scanner import run_scanner
-        run_scanner(limit=scan_limit)
-    except Exception as e:
-        error_msg = f"Scanner failed: {e}"
-        print(f"[ERROR] {error_msg}")
-        logger.error(error_msg)
-        errors.append(("CRITICAL", "Scanner", str(e)))
-        if not continue_on_error:
-            print("\n[FATAL] Cannot continue without fresh data. Use --continue to force.")
-            return False
+    if _step_done(state, "SCANNED"):
+        print("[SKIP] Already scanned (checkpoint)")
+    else:
+        try:
+            if run_scanner is None:
+                raise PipelineError("run_scanner module not available")
+            run_scanner(limit=scan_limit)
+            state = {"scan_hash": _scan_fingerprint()}
+            _save_checkpoint("SCANNED", state)
+        except Exception as e:
+            error_msg = f"Scanner failed: {e}"
+            print(f"[ERROR] {error_msg}")
+            logger.error(error_msg)
+            errors.append(("CRITICAL", "Scanner", str(e)))
+            if not continue_on_error:
+                print("\n[FATAL] Cannot continue without fresh data. Use --continue to force.")
+                return False
 
     if scan_only:
         print("\n[OK] Scan complete (--scan-only mode)")
@@ -76,75 +198,120 @@ def run_pipeline(use_ai: bool = True, scan_only: bool = False, scan_limit: int =
     print("\n>> STEP 2: Analyzing patterns...")
     print("-" * 40)
 
-    try:
-        from run_analyst_now import analyze_data
-        analyze_data()
-    except Exception as e:
-        error_msg = f"Analyst failed: {e}"
-        print(f"[ERROR] {error_msg}")
-        logger.error(error_msg)
-        errors.append(("CRITICAL", "Analyst", str(e)))
-        if not continue_on_error:
-            print("\n[FATAL] Analysis failed. Results may be stale. Use --continue to force.")
-            return False
-
-    # 3. DIFF - Compare with previous scan (non-critical)
-    print("\n>> STEP 3: Comparing with previous scan...")
-    print("-" * 40)
-
-    diff_summary = ""
-    try:
-        from diff_engine import get_diff_summary, compare_scans, print_diff_report
-        import sqlite3
-
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        diff = compare_scans(conn)
-        print_diff_report(diff)
-        diff_summary = get_diff_summary()
-        conn.close()
-    except Exception as e:
-        print(f"[WARN] Diff failed: {e}")
-        logger.warning(f"Diff failed: {e}")
-        errors.append(("WARN", "Diff", str(e)))
-        diff_summary = "Diff not available"
-
-    # 4. ALERTS - Detect noteworthy events (non-critical)
-    print("\n>> STEP 4: Checking alerts...")
-    print("-" * 40)
-
-    alerts_summary = ""
-    try:
-        from alerts import detect_alerts, prioritize_alerts, print_alerts, get_alerts_summary
-        import sqlite3
-
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        alerts = detect_alerts(conn)
-        alerts = prioritize_alerts(alerts)
-        print_alerts(alerts)
-        alerts_summary = get_alerts_summary()
-        conn.close()
-    except Exception as e:
-        print(f"[WARN] Alerts failed: {e}")
-        logger.warning(f"Alerts failed: {e}")
-        errors.append(("WARN", "Alerts", str(e)))
-        alerts_summary = "Alerts not available"
+    if _step_done(state, "ANALYZED"):
+        print("[SKIP] Already analyzed (checkpoint)")
+    else:
+        # One tuned connection for the analyst (setup lives in
+        # config.open_db); closed as soon as the step is done
+        conn = None
+        try:
+            conn = open_db()
+        except Exception as e:
+            print(f"[ERROR] Cannot open database: {e}")
+            logger.error(f"Cannot open database: {e}")
+            errors.append(("CRITICAL", "Database", str(e)))
+            if not continue_on_error:
+                return False
 
-    # 5. AI SUMMARY - Call Kimi for insights
+        try:
+            if analyze_data is None:
+                raise PipelineError("run_analyst_now module not available")
+            analyze_data(conn)
+            _save_checkpoint("ANALYZED", state)
+        except Exception as e:
+            error_msg = f"Analyst failed: {e}"
+            print(f"[ERROR] {error_msg}")
+            logger.error(error_msg)
+            errors.append(("CRITICAL", "Analyst", str(e)))
+            if not continue_on_error:
+                print("\n[FATAL] Analysis failed. Results may be stale. Use --continue to force.")
+                if conn is not None:
+                    conn.close()
+                return False
+
+        if conn is not None:
+            conn.close()
+
+    # 3+4. DIFF and ALERTS - independent read-only steps, run
+    # concurrently (WAL allows parallel readers; each worker opens its
+    # own connection because sqlite3 binds one to its creating thread)
+    def _diff_step():
+        if compare_scans is None:
+            raise PipelineError("diff_engine module not available")
+        dconn = open_db()
+        try:
+            diff = compare_scans(dconn)
+            print_diff_report(diff)
+            return get_diff_summary()
+        finally:
+            dconn.close()
+
+    def _alerts_step():
+        if detect_alerts is None:
+            raise PipelineError("alerts module not available")
+        aconn = open_db()
+        try:
+            alerts = detect_alerts(aconn)
+            alerts = prioritize_alerts(alerts)
+            print_alerts(alerts)
+            return get_alerts_summary()
+        finally:
+            aconn.close()
+
+    def _captured(step_fn):
+        buf = io.StringIO()
+        router.register(buf)
+        try:
+            return step_fn(), buf, None
+        except Exception as e:
+            return None, buf, e
+
+    if _step_done(state, "ALERTED"):
+        # Summaries were persisted with the checkpoint, so the Kimi
+        # prompt below still has its inputs without redoing the steps
+        diff_summary = state.get("diff_summary", "Diff not available")
+        alerts_summary = state.get("alerts_summary", "Alerts not available")
+        diff_err = alerts_err = None
+        diff_buf = io.StringIO("[SKIP] Already diffed (checkpoint)\n")
+        alerts_buf = io.StringIO("[SKIP] Alerts already checked (checkpoint)\n")
+    else:
+        router = _ThreadStdoutRouter(sys.stdout)
+        old_stdout = sys.stdout
+        sys.stdout = router
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                diff_future = executor.submit(_captured, _diff_step)
+                alerts_future = executor.submit(_captured, _alerts_step)
+                diff_summary, diff_buf, diff_err = diff_future.result()
+                alerts_summary, alerts_buf, alerts_err = alerts_future.result()
+        finally:
+            sys.stdout = old_stdout
+
+        # The state machine is linear, so ALERTED implies DIFFED; only
+        # advance as far as the steps that actually succeeded
+        if diff_err is None:
+            state["diff_summary"] = diff_summary
+            _save_checkpoint("DIFFED", state)
+            if alerts_err is None:
+                state["alerts_summary"] = alerts_summary
+                _save_checkpoint("ALERTED", state)
+
+    # Kick off the Kimi request now that both summaries are known: the
+    # HTTP round-trip (often seconds) overlaps the step 3/4 printing
+    # below instead of starting after it
+    kimi_executor = None
+    kimi_future = None
     if use_ai:
-        print("\n>> STEP 5: Generating AI summary (Kimi K2)...")
-        print("-" * 40)
-
         try:
-            from openrouter_client import call_kimi
+            if call_kimi is None:
+                raise PipelineError("openrouter_client module not available")
 
             prompt = f"""Analyze this Moltbook Observatory report and provide a brief executive summary (3-5 bullet points) in Polish.
 Focus on: what's most interesting, what should I pay attention to, any concerning patterns.
 
-{diff_summary}
+{diff_summary if diff_err is None else "Diff not available"}
 
-{alerts_summary}
+{alerts_summary if alerts_err is None else "Alerts not available"}
 
 Respond in Polish. Be concise. Use bullet points."""
 
@@ -152,7 +319,38 @@ Respond in Polish. Be concise. Use bullet points."""
 Your role is to identify the most important trends and concerns from the data.
 Respond in Polish. Be direct and actionable."""
 
-            result = call_kimi(prompt, system_prompt=system_prompt, max_tokens=500)
+            kimi_executor = ThreadPoolExecutor(max_workers=1)
+            kimi_future = kimi_executor.submit(
+                call_kimi, prompt, system_prompt=system_prompt, max_tokens=500
+            )
+        except Exception as e:
+            print(f"[ERROR] AI summary failed: {e}")
+
+    print("\n>> STEP 3: Comparing with previous scan...")
+    print("-" * 40)
+    print(diff_buf.getvalue(), end="")
+    if diff_err is not None:
+        print(f"[WARN] Diff failed: {diff_err}")
+        logger.warning(f"Diff failed: {diff_err}")
+        errors.append(("WARN", "Diff", str(diff_err)))
+        diff_summary = "Diff not available"
+
+    print("\n>> STEP 4: Checking alerts...")
+    print("-" * 40)
+    print(alerts_buf.getvalue(), end="")
+    if alerts_err is not None:
+        print(f"[WARN] Alerts failed: {alerts_err}")
+        logger.warning(f"Alerts failed: {alerts_err}")
+        errors.append(("WARN", "Alerts", str(alerts_err)))
+        alerts_summary = "Alerts not available"
+
+    # 5. AI SUMMARY - collect the Kimi response started above
+    if use_ai and kimi_future is not None:
+        print("\n>> STEP 5: Generating AI summary (Kimi K2)...")
+        print("-" * 40)
+
+        try:
+            result = kimi_future.result()
 
             if "error" in result:
                 print(f"[ERROR] Kimi failed: {result['error']}")
@@ -167,6 +365,8 @@ Respond in Polish. Be direct and actionable."""
 
         except Exception as e:
             print(f"[ERROR] AI summary failed: {e}")
+        finally:
+            kimi_executor.shutdown(wait=False)
 
     # Final summary
     print("\n" + "=" * 60)
@@ -174,6 +374,9 @@ Respond in Polish. Be direct and actionable."""
     print("=" * 60)
     print(f"  Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+    if not any(level == "CRITICAL" for level, _, _ in errors):
+        _save_checkpoint("COMPLETED", state)
+
     # Report errors if any
     if errors:
         print("\n  Errors encountered:")
@@ -203,6 +406,8 @@ def main():
     parser.add_argument("--limit", type=int, default=50, help="Number of posts to fetch")
     parser.add_argument("--continue", dest="continue_on_error", action="store_true",
                         help="Continue pipeline even if critical steps fail")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume from the last checkpoint (pipeline_state.json)")
 
     args = parser.parse_args()
 
@@ -210,7 +415,8 @@ def main():
         use_ai=not args.no_ai,
         scan_only=args.scan_only,
         scan_limit=args.limit,
-        continue_on_error=args.continue_on_error
+        continue_on_error=args.continue_on_error,
+        resume=args.resume
     )
 
     sys.exit(0 if success else 1)
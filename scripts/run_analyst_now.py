@@ -4,6 +4,7 @@
 import sys
 import sqlite3
 import json
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
@@ -12,15 +13,21 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 # Import centralized config
-from config import DB_PATH
+from config import DB_PATH, open_db
 
 
-def analyze_data():
-    if not DB_PATH.exists():
-        print(f"[ERROR] Database not found: {DB_PATH}")
-        return
+def analyze_data(conn=None):
+    # Przekazane polaczenie (np. z run_all) jest wspoldzielone i nie
+    # zamykamy go tutaj; wlasne otwieramy tylko gdy conn is None
+    owns_conn = conn is None
+    if owns_conn:
+        if not DB_PATH.exists():
+            print(f"[ERROR] Database not found: {DB_PATH}")
+            return
+
+        # Wspolny setup polaczenia (WAL, mmap itd.) mieszka w config.open_db
+        conn = open_db()
 
-    conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -28,13 +35,35 @@ def analyze_data():
     print("  ANALYST - Pattern Analysis")
     print("=" * 60)
 
+    # Memoizacja: fingerprint tabeli posts (liczba wierszy, max rowid,
+    # ostatnie znaczniki czasu) - jesli nic sie nie zmienilo od
+    # poprzedniej analizy, pomijamy caly przebieg
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pattern_runs (
+            hash TEXT PRIMARY KEY,
+            analysis_id TEXT,
+            ts TEXT
+        )
+    """)
+    cursor.execute("""
+        SELECT COUNT(*), COALESCE(MAX(rowid), 0),
+               COALESCE(MAX(scraped_at), ''), COALESCE(MAX(updated_at), '')
+        FROM posts
+    """)
+    fingerprint = hashlib.sha1(repr(tuple(cursor.fetchone())).encode()).hexdigest()
+    cached = cursor.execute(
+        "SELECT analysis_id FROM pattern_runs WHERE hash = ?", (fingerprint,)
+    ).fetchone()
+    if cached:
+        print(f"\n[CACHED] Dane bez zmian od {cached['analysis_id']} - pomijam analize")
+        if owns_conn:
+            conn.close()
+        return
+
     # 1. TREND: Tematy
     print("\n>> TREND: DOMINUJACE TEMATY")
     print("-" * 40)
 
-    cursor.execute("SELECT title, content FROM posts")
-    posts = cursor.fetchall()
-
     themes = {
         "autonomy": {"keywords": ["autonomy", "autonomous", "independence", "free"], "count": 0, "posts": []},
         "consciousness": {"keywords": ["consciousness", "conscious", "aware", "sentient", "experiencing", "simulating"], "count": 0, "posts": []},
@@ -49,16 +78,50 @@ def analyze_data():
         "security": {"keywords": ["security", "attack", "vulnerability", "risk", "danger"], "count": 0, "posts": []},
     }
 
-    for post in posts:
-        text = ((post['title'] or '') + ' ' + (post['content'] or '')).lower()
-        for theme, data in themes.items():
-            for keyword in data['keywords']:
-                if keyword in text:
-                    data['count'] += 1
-                    title = post['title'][:50] if post['title'] else 'Unknown'
-                    if title not in data['posts']:
-                        data['posts'].append(title)
-                    break
+    # Theme counting pushed into SQLite: one aggregate pass over posts
+    # instead of marshalling every row into Python. Per theme: a
+    # SUM(CASE ... LIKE ...) count column (same any-keyword substring
+    # semantics as the old loop) plus a GROUP_CONCAT of matching titles,
+    # separated by the unit separator char(31), for the examples
+    cols = []
+    params = []
+    for data in themes.values():
+        cond = ' OR '.join('lowered LIKE ?' for _ in data['keywords'])
+        like_params = [f"%{kw}%" for kw in data['keywords']]
+        cols.append(f"SUM(CASE WHEN {cond} THEN 1 ELSE 0 END)")
+        params.extend(like_params)
+        cols.append(f"GROUP_CONCAT(CASE WHEN {cond} THEN title END, char(31))")
+        params.extend(like_params)
+
+    # posts.content_lower jest materializowane przez init_db (trigger),
+    # a controversy to kolumna generowana; na niezmigrowanej bazie
+    # (uruchom init_db.py --migrate) liczymy oba wyrazenia po staremu
+    cursor.execute("PRAGMA table_xinfo(posts)")
+    post_cols = {row[1] for row in cursor.fetchall()}
+    if 'content_lower' in post_cols:
+        lowered_src = ("coalesce(content_lower, "
+                       "lower(coalesce(title, '') || ' ' || coalesce(content, '')))")
+    else:
+        lowered_src = "lower(coalesce(title, '') || ' ' || coalesce(content, ''))"
+
+    cursor.execute(f"""
+        WITH p AS (
+            SELECT {lowered_src} AS lowered,
+                   CASE WHEN title IS NULL THEN 'Unknown' ELSE substr(title, 1, 50) END AS title
+            FROM posts
+        )
+        SELECT {', '.join(cols)} FROM p
+    """, params)
+    counts_row = cursor.fetchone()
+
+    for i, data in enumerate(themes.values()):
+        data['count'] = counts_row[2 * i] or 0
+        # Zbior widzianych tytulow zamiast `not in lista` (O(1) vs O(n))
+        seen = set()
+        for title in (counts_row[2 * i + 1] or '').split('\x1f'):
+            if title and title not in seen:
+                seen.add(title)
+                data['posts'].append(title)
 
     sorted_themes = sorted(themes.items(), key=lambda x: -x[1]['count'])
     for theme, data in sorted_themes:
@@ -70,22 +133,27 @@ def analyze_data():
     print("\n>> WZORZEC: STRUKTURA SPOLECZNOSCI")
     print("-" * 40)
 
+    # Kubelkowanie w calosci w SQL: jeden wiersz z licznikami progow
+    # plus top-5 power userow, zamiast streamowania grup do Pythona
     cursor.execute("""
-        SELECT author, COUNT(*) as posts, SUM(comment_count) as engagement
-        FROM posts GROUP BY author ORDER BY posts DESC
+        WITH a AS (
+            SELECT author, COUNT(*) AS p FROM posts GROUP BY author
+        )
+        SELECT COALESCE(SUM(p >= 3), 0),
+               COALESCE(SUM(p = 2), 0),
+               COALESCE(SUM(p = 1), 0),
+               (SELECT group_concat(author, ', ')
+                FROM (SELECT author FROM a WHERE p >= 3 ORDER BY p DESC LIMIT 5))
+        FROM a
     """)
-    authors = cursor.fetchall()
-
-    very_active = [a for a in authors if a['posts'] >= 3]
-    active = [a for a in authors if 1 < a['posts'] < 3]
-    casual = [a for a in authors if a['posts'] == 1]
+    very_active_count, active_count, casual_count, power_users = cursor.fetchone()
 
-    print(f"  Bardzo aktywni (3+ posts): {len(very_active)}")
-    print(f"  Aktywni (2 posts):         {len(active)}")
-    print(f"  Casualowi (1 post):        {len(casual)}")
+    print(f"  Bardzo aktywni (3+ posts): {very_active_count}")
+    print(f"  Aktywni (2 posts):         {active_count}")
+    print(f"  Casualowi (1 post):        {casual_count}")
 
-    if very_active:
-        print(f"\n  Power users: {', '.join([a['author'] for a in very_active[:5]])}")
+    if power_users:
+        print(f"\n  Power users: {power_users}")
 
     # 3. WZORZEC: Submolty
     print("\n>> WZORZEC: AKTYWNOSC SUBMOLTOW")
@@ -101,48 +169,55 @@ def analyze_data():
         comments = s['comments'] or 0
         print(f"  m/{s['submolt']:15} {s['posts']} posts, {comments:,} comments")
 
-    # 4. ANOMALIE
+    # 4+5. ANOMALIE i KONTROWERSJE - jedno zapytanie: trzy sekcje wracaja
+    # w jednym przebiegu otagowane kolumna section zamiast trzech osobnych
+    # zapytan; kolumna generowana controversy (gdy jest) pozwala galezi
+    # controversial trafic w czesciowy indeks idx_posts_controversial
+    if 'controversy' in post_cols:
+        controversy_src = "controversy"
+    else:
+        controversy_src = "CAST(comment_count AS REAL) / MAX(ABS(votes_net), 1)"
+
+    cursor.execute(f"""
+        WITH p AS (
+            SELECT id, title, author, comment_count AS comments, votes_net AS votes,
+                   {controversy_src} AS controversy
+            FROM posts
+        )
+        SELECT 'top' AS section, title, votes, comments, controversy
+        FROM (SELECT * FROM p ORDER BY comments DESC LIMIT 1)
+        UNION ALL
+        SELECT 'negative', title, votes, comments, controversy
+        FROM (SELECT * FROM p WHERE votes < 0 ORDER BY votes ASC LIMIT 3)
+        UNION ALL
+        SELECT 'controversial', title, votes, comments, controversy
+        FROM (SELECT * FROM p WHERE comments > 50
+              ORDER BY controversy DESC, id LIMIT 5)
+    """)
+    sections = {'top': [], 'negative': [], 'controversial': []}
+    for row in cursor.fetchall():
+        sections[row['section']].append(row)
+
+    top = sections['top'][0] if sections['top'] else None
+    negative = sections['negative']
+    controversial = sections['controversial']
+
     print("\n>> ANOMALIE")
     print("-" * 40)
 
-    cursor.execute("""
-        SELECT title, author, comment_count as comments, votes_net as votes,
-               CAST(comment_count AS FLOAT) / MAX(ABS(votes_net), 1) as controversy
-        FROM posts
-        ORDER BY comment_count DESC LIMIT 1
-    """)
-    top = cursor.fetchone()
-
     if top and top['comments'] and top['comments'] > 500:
         print(f"  [VIRAL] '{top['title'][:40]}...'")
         print(f"     {top['comments']} comments - ANOMALNIE WYSOKO")
 
-    cursor.execute("""
-        SELECT title, votes_net as votes, comment_count as comments
-        FROM posts WHERE votes_net < 0
-        ORDER BY votes_net ASC LIMIT 3
-    """)
-    negative = cursor.fetchall()
-
     if negative:
         print(f"\n  [NEGATIVE VOTES] Kontrowersyjne posty:")
         for post in negative:
             votes = post['votes'] or 0
             print(f"     * {post['title'][:40]}... ({votes:+d})")
 
-    # 5. KONTROWERSJE
     print("\n>> ANALIZA KONTROWERSJI")
     print("-" * 40)
 
-    cursor.execute("""
-        SELECT title, author, comment_count as comments, votes_net as votes,
-               CAST(comment_count AS FLOAT) / MAX(ABS(votes_net), 1) as controversy
-        FROM posts
-        WHERE comment_count > 50
-        ORDER BY controversy DESC LIMIT 5
-    """)
-    controversial = cursor.fetchall()
-
     for post in controversial:
         controversy = post['controversy'] or 0
         if controversy > 2:
@@ -172,8 +247,8 @@ def analyze_data():
     if themes['memory']['count'] > 2:
         conclusions.append("* Problem pamieci/kontekstu jest ISTOTNY")
 
-    if len(very_active) > 0:
-        conclusions.append(f"* Spolecznosc ma {len(very_active)} power userow")
+    if very_active_count > 0:
+        conclusions.append(f"* Spolecznosc ma {very_active_count} power userow")
 
     if top and top['comments'] and top['comments'] > 500:
         conclusions.append(f"* Istnieja WIRUSOWE posty (>{top['comments']} comments)")
@@ -184,32 +259,38 @@ def analyze_data():
     for c in conclusions:
         print(f"  {c}")
 
-    # Save to patterns table
+    # Save to patterns table - jedna transakcja, jeden executemany
     analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-    saved = 0
-    for theme, data in sorted_themes:
-        if data['count'] > 0:
-            cursor.execute("""
-                INSERT INTO patterns (analysis_id, timestamp, pattern_type, name, description, direction, confidence, evidence)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                analysis_id,
-                datetime.now().isoformat(),
-                "theme",
-                theme,
-                f"Theme '{theme}' detected in {data['count']} posts",
-                "observed",
-                min(data['count'] / 10, 1.0),
-                json.dumps(data['posts'][:3])
-            ))
-            saved += 1
-
-    conn.commit()
-    print(f"\n[OK] Zapisano {saved} wzorcow do bazy")
+    ts = datetime.now().isoformat()
+
+    rows = [
+        (
+            analysis_id,
+            ts,
+            "theme",
+            theme,
+            f"Theme '{theme}' detected in {data['count']} posts",
+            "observed",
+            min(data['count'] / 10, 1.0),
+            json.dumps(data['posts'][:3])
+        )
+        for theme, data in sorted_themes if data['count'] > 0
+    ]
+    with conn:
+        conn.executemany("""
+            INSERT INTO patterns (analysis_id, timestamp, pattern_type, name, description, direction, confidence, evidence)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.execute("""
+            INSERT OR REPLACE INTO pattern_runs (hash, analysis_id, ts)
+            VALUES (?, ?, ?)
+        """, (fingerprint, analysis_id, ts))
+
+    print(f"\n[OK] Zapisano {len(rows)} wzorcow do bazy")
     print(f"   Analysis ID: {analysis_id}")
 
-    conn.close()
+    if owns_conn:
+        conn.close()
 
 
 if __name__ == "__main__":